@@ -39,6 +39,9 @@ class ComponentBuilder(models.AbstractModel):
     _description = "Component Builder"
 
     _components_registry_cache_size = DEFAULT_CACHE_SIZE
+    #: when True, the lookups of the components registry are precomputed
+    #: once it is ready, see :meth:`~.core.ComponentRegistry.freeze`
+    _components_registry_freeze = False
 
     def _register_hook(self):
         # This method is called by Odoo when the registry is built,
@@ -47,6 +50,8 @@ class ComponentBuilder(models.AbstractModel):
         # registry so we have an empty cache and we'll add components in it.
         components_registry = self._init_global_registry()
         self.build_registry(components_registry)
+        if self._components_registry_freeze:
+            components_registry.freeze()
         components_registry.ready = True
 
     def _init_global_registry(self):
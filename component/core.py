@@ -18,7 +18,7 @@ The most common classes used publicly are:
 
 import logging
 import operator
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, namedtuple
 
 from odoo import models
 from odoo.tools import LastOrderedSet, OrderedSet
@@ -56,6 +56,19 @@ def _get_addon_name(full_name):
     return addon_name
 
 
+# Indexes of the concrete components of a ComponentRegistry, see
+# ComponentRegistry._build_indexes()
+LookupIndexes = namedtuple(
+    "LookupIndexes",
+    ["components", "by_collection_usage", "by_collection", "by_usage", "by_model"],
+)
+
+
+# Key used in the frozen lookups of a ComponentRegistry for the collections
+# and models on which no component is registered
+_OTHER = object()
+
+
 class ComponentDatabases(dict):
     """Holds a registry of components for each database"""
 
@@ -71,6 +84,10 @@ class ComponentRegistry:
     The :attr:`ready` attribute must be set to ``True`` when all the components
     are loaded.
 
+    The lookups use secondary indexes on ``(_collection, _usage)`` and on the
+    models of ``_apply_on``. They are built lazily on the first lookup
+    following a change in the registry, so loading components stays cheap.
+
     """
 
     def __init__(self, cachesize=DEFAULT_CACHE_SIZE):
@@ -78,12 +95,21 @@ class ComponentRegistry:
         self._components = OrderedDict()
         self._loaded_modules = set()
         self.ready = False
+        self._indexes = None
+        self._frozen_lookups = None
+        self._frozen_collections = None
+        # components matching a lookup, see WorkContext._lookup_components()
+        self._match_cache = LRUCache(maxsize=cachesize)
 
     def __getitem__(self, key):
         return self._components[key]
 
     def __setitem__(self, key, value):
         self._components[key] = value
+        # a component has been added or rebuilt, its collection, usage or
+        # models may have changed: rebuild the indexes on next lookup
+        self._indexes = None
+        self._frozen_lookups = None
 
     def __contains__(self, key):
         return key in self._components
@@ -101,7 +127,48 @@ class ComponentRegistry:
             component_class._build_component(self)
         self._loaded_modules.add(module)
 
-    @cachedmethod(operator.attrgetter("_cache"))
+    def _build_indexes(self):
+        """Index the concrete components for the lookups
+
+        The indexes map a ``(_collection, _usage)``, a ``_collection``, a
+        ``_usage`` or a model name to the set of positions of the matching
+        components in the registry. Sets of positions can be intersected,
+        then sorted to keep the registration order of the components.
+
+        Components without ``_apply_on`` are indexed under the ``None`` model.
+        """
+        components = []
+        by_collection_usage = defaultdict(set)
+        by_collection = defaultdict(set)
+        by_usage = defaultdict(set)
+        by_model = defaultdict(set)
+        for component in self._components.values():
+            if component._abstract:
+                continue
+            position = len(components)
+            components.append(component)
+            by_collection_usage[(component._collection, component._usage)].add(position)
+            by_collection[component._collection].add(position)
+            by_usage[component._usage].add(position)
+            apply_on_models = component.apply_on_models
+            if apply_on_models is None:
+                by_model[None].add(position)
+            else:
+                for model_name in apply_on_models:
+                    by_model[model_name].add(position)
+        return LookupIndexes(
+            tuple(components),
+            dict(by_collection_usage),
+            dict(by_collection),
+            dict(by_usage),
+            dict(by_model),
+        )
+
+    def _get_indexes(self):
+        if self._indexes is None:
+            self._indexes = self._build_indexes()
+        return self._indexes
+
     def lookup(self, collection_name=None, usage=None, model_name=None):
         """Find and return a list of components for a usage
 
@@ -130,38 +197,115 @@ class ComponentRegistry:
         :param usage: the usage of component we are looking for
         :param model_name: filter on components that apply on this model
 
-        """
-
-        # keep the order so addons loaded first have components used first
-        candidates = (
-            component
-            for component in self._components.values()
-            if not component._abstract
-        )
+        When the registry has been frozen (see :meth:`freeze`), the result
+        is a tuple read from the precomputed lookup table.
 
-        if collection_name is not None:
-            candidates = (
-                component
-                for component in candidates
-                if (
-                    component._collection == collection_name
-                    or component._collection is None
-                )
-            )
+        """
+        frozen_lookups = self._frozen_lookups
+        if frozen_lookups is not None:
+            try:
+                return frozen_lookups[(collection_name, usage, model_name)]
+            except KeyError:
+                return self._frozen_lookup_miss(collection_name, usage, model_name)
+        return self._cached_lookup(collection_name, usage, model_name)
 
-        if usage is not None:
-            candidates = (
-                component for component in candidates if component._usage == usage
+    @cachedmethod(operator.attrgetter("_cache"))
+    def _cached_lookup(self, collection_name, usage, model_name):
+        return self._lookup(collection_name, usage, model_name)
+
+    def _lookup(self, collection_name, usage, model_name):
+        """Find the components using the indexes, without cache"""
+        indexes = self._get_indexes()
+        empty = frozenset()
+
+        # None means that we do not filter on the criteria
+        positions = None
+        if collection_name is not None and usage is not None:
+            by_collection_usage = indexes.by_collection_usage
+            positions = by_collection_usage.get(
+                (collection_name, usage), empty
+            ) | by_collection_usage.get((None, usage), empty)
+        elif collection_name is not None:
+            by_collection = indexes.by_collection
+            positions = by_collection.get(collection_name, empty) | by_collection.get(
+                None, empty
             )
+        elif usage is not None:
+            positions = indexes.by_usage.get(usage, empty)
 
         if model_name is not None:
-            candidates = (
-                c
-                for c in candidates
-                if c.apply_on_models is None or model_name in c.apply_on_models
+            by_model = indexes.by_model
+            model_positions = by_model.get(model_name, empty) | by_model.get(
+                None, empty
             )
+            if positions is None:
+                positions = model_positions
+            else:
+                positions = positions & model_positions
+
+        if positions is None:
+            return list(indexes.components)
+        # keep the order so addons loaded first have components used first
+        return [indexes.components[position] for position in sorted(positions)]
+
+    def freeze(self):
+        """Precompute the results of all the lookups
+
+        Meant to be called once all the components are loaded. For every
+        usage, it computes the result of the lookups for the collections and
+        models the candidate components are registered on, plus an entry
+        for any other collection or model. The results are stored as tuples
+        in a table, so a lookup becomes a dict access and the LRU cache is
+        no longer used.
 
-        return list(candidates)
+        Adding a component to the registry unfreezes it.
+        """
+        indexes = self._get_indexes()
+        frozen_lookups = {}
+        frozen_collections = set()
+        for usage in set(indexes.by_usage) | {None}:
+            usage_components = self._lookup(None, usage, None)
+            collection_names = {
+                component._collection
+                for component in usage_components
+                if component._collection is not None
+            }
+            frozen_collections.update(
+                (collection_name, usage) for collection_name in collection_names
+            )
+            for collection_name in [None, _OTHER] + list(collection_names):
+                components = self._lookup(collection_name, usage, None)
+                model_names = {
+                    model_name
+                    for component in components
+                    for model_name in component.apply_on_models or ()
+                }
+                for model_name in [None, _OTHER] + list(model_names):
+                    frozen_lookups[(collection_name, usage, model_name)] = tuple(
+                        self._lookup(collection_name, usage, model_name)
+                    )
+        self._frozen_collections = frozen_collections
+        self._frozen_lookups = frozen_lookups
+
+    def _frozen_lookup_miss(self, collection_name, usage, model_name):
+        """Lookup in the frozen table for a key not precomputed
+
+        A collection or a model on which no candidate component is registered
+        has the same result than any other unknown collection or model.
+        The result is stored in the table for the next lookups.
+        """
+        frozen_lookups = self._frozen_lookups
+        key_collection = collection_name
+        if (
+            collection_name is not None
+            and (collection_name, usage) not in self._frozen_collections
+        ):
+            key_collection = _OTHER
+        result = frozen_lookups.get((key_collection, usage, model_name))
+        if result is None:
+            result = frozen_lookups.get((key_collection, usage, _OTHER), ())
+        frozen_lookups[(collection_name, usage, model_name)] = result
+        return result
 
 
 # We will store a ComponentRegistry per database here,
@@ -264,6 +408,8 @@ class WorkContext:
         for attr_name, value in kwargs.items():
             setattr(self, attr_name, value)
             self._propagate_kwargs.append(attr_name)
+        # work contexts created by work_on() for other models
+        self._child_works = {}
 
     @property
     def env(self):
@@ -277,7 +423,16 @@ class WorkContext:
         """Create a new work context for another model keeping attributes
 
         Used when one need to lookup components for another model.
+
+        The work contexts created for another model of the same collection
+        are kept and reused as long as the attributes they propagate are
+        the same than the ones of the current work context.
         """
+        reusable = collection is None and model_name is not None
+        if reusable:
+            child = self._child_works.get(model_name)
+            if child is not None and child._propagated_from(self):
+                return child
         kwargs = {
             attr_name: getattr(self, attr_name) for attr_name in self._propagate_kwargs
         }
@@ -285,7 +440,20 @@ class WorkContext:
             kwargs["collection"] = collection
         if model_name is not None:
             kwargs["model_name"] = model_name
-        return self.__class__(**kwargs)
+        child = self.__class__(**kwargs)
+        if reusable:
+            self._child_works[model_name] = child
+        return child
+
+    def _propagated_from(self, parent):
+        """Indicate if the attributes are still the ones of ``parent``"""
+        if self._propagate_kwargs != parent._propagate_kwargs:
+            return False
+        return all(
+            getattr(self, attr_name) is getattr(parent, attr_name)
+            for attr_name in parent._propagate_kwargs
+            if attr_name != "model_name"
+        )
 
     def _component_class_by_name(self, name):
         components_registry = self.components_registry
@@ -346,29 +514,63 @@ class WorkContext:
             work_context = self.work_on(model_name)
         return component_class(work_context)
 
+    def _match_component(self, cls, usage=None, model_name=None, **kw):
+        try:
+            return cls._component_match(self, usage=usage, model_name=model_name, **kw)
+        except TypeError as err:
+            # Backward compat
+            _logger.info(str(err))
+            _logger.info(
+                "The signature of %s._component_match has changed. "
+                "Please, adapt your code as "
+                "(self, usage=usage, model_name=model_name, **kw)",
+                cls.__name__,
+            )
+            return cls._component_match(self)
+
+    def _match_plan(self, component_classes, usage=None, model_name=None, **kw):
+        """Evaluate the static matches of the candidate components
+
+        Return a list of ``(component_class, static)`` for the candidates,
+        without the ones which have a static match returning False.
+        ``static`` is False when the match must be evaluated on every lookup.
+        """
+        plan = []
+        for cls in component_classes:
+            if not cls._has_static_component_match():
+                plan.append((cls, False))
+            elif self._match_component(cls, usage=usage, model_name=model_name, **kw):
+                plan.append((cls, True))
+        return plan
+
     def _lookup_components(self, usage=None, model_name=None, **kw):
-        component_classes = self.components_registry.lookup(
-            self.collection._name, usage=usage, model_name=model_name
+        collection_name = self.collection._name
+        components_registry = self.components_registry
+        component_classes = components_registry.lookup(
+            collection_name, usage=usage, model_name=model_name
         )
-        matching_components = []
-        for cls in component_classes:
-            try:
-                matching = cls._component_match(
-                    self, usage=usage, model_name=model_name, **kw
-                )
-            except TypeError as err:
-                # Backward compat
-                _logger.info(str(err))
-                _logger.info(
-                    "The signature of %s._component_match has changed. "
-                    "Please, adapt your code as "
-                    "(self, usage=usage, model_name=model_name, **kw)",
-                    cls.__name__,
-                )
-                matching = cls._component_match(self)
-            if matching:
-                matching_components.append(cls)
-        return matching_components
+        # the static matches are evaluated once for a lookup result and kept
+        # in the registry as long as the lookup returns the same result
+        try:
+            key = (collection_name, usage, model_name, frozenset(kw.items()))
+            cached = components_registry._match_cache.get(key)
+        except TypeError:
+            # unhashable keyword arguments, evaluate the matches every time
+            key = cached = None
+        if cached is not None and cached[0] is component_classes:
+            plan = cached[1]
+        else:
+            plan = self._match_plan(
+                component_classes, usage=usage, model_name=model_name, **kw
+            )
+            if key is not None:
+                components_registry._match_cache[key] = (component_classes, plan)
+        return [
+            cls
+            for cls, static in plan
+            if static
+            or self._match_component(cls, usage=usage, model_name=model_name, **kw)
+        ]
 
     def _filter_components_by_collection(self, component_classes):
         return [c for c in component_classes if c._collection == self.collection._name]
@@ -691,6 +893,11 @@ class AbstractComponent(metaclass=MetaComponent):
     #: Component purpose ('import.mapper', ...).
     _usage = None
 
+    #: Set to True when :meth:`_component_match` depends only on the
+    #: ``usage``, ``model_name`` and keyword arguments of the lookup,
+    #: and never on the work context: its result is then cached.
+    _static_component_match = False
+
     def __init__(self, work_context):
         super().__init__()
         self.work = work_context
@@ -709,13 +916,31 @@ class AbstractComponent(metaclass=MetaComponent):
         Beware, if the lookups from usage, model and collection are
         cached, the calls to :meth:`_component_match` are executed
         each time we get components. Heavy computation should be
-        avoided.
+        avoided. When the result does not depend on the work context,
+        set :attr:`_static_component_match` on the component, in the class
+        defining this method, so the result is cached for a collection,
+        usage, model and keyword arguments.
 
         :param work: the :class:`WorkContext` we are working with
 
         """
         return True
 
+    @classmethod
+    def _has_static_component_match(cls):
+        """Indicate if the result of :meth:`_component_match` can be cached
+
+        :attr:`_static_component_match` is only trusted when it is declared
+        on the class defining :meth:`_component_match`, a sub-class
+        overriding it with a dynamic match must not inherit the flag.
+        """
+        for klass in cls.__mro__:
+            if "_component_match" in vars(klass):
+                return klass is AbstractComponent or vars(klass).get(
+                    "_static_component_match", False
+                )
+        return False
+
     @property
     def collection(self):
         """Collection we are working with"""
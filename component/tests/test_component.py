@@ -380,3 +380,76 @@ class TestComponent(TransactionComponentRegistryCase):
             # _component_match method
             comp = base.component(usage="speaker", model_name=self.env["res.partner"])
             self.assertEqual("bar", comp._name)
+
+    def test_component_match_static(self):
+        """The static matches are evaluated once"""
+        calls = []
+
+        class Foo(Component):
+            _name = "foo"
+            _collection = "collection.base"
+            _usage = "speaker"
+            _apply_on = ["res.partner"]
+            _static_component_match = True
+
+            @classmethod
+            def _component_match(cls, work, usage=None, model_name=None, **kw):
+                calls.append(cls._name)
+                return kw.get("lang") == "fr"
+
+        class Bar(Component):
+            _name = "bar"
+            _collection = "collection.base"
+            _usage = "speaker"
+            _apply_on = ["res.partner"]
+
+            @classmethod
+            def _component_match(cls, work, usage=None, model_name=None, **kw):
+                calls.append(cls._name)
+                return kw.get("lang") != "fr"
+
+        self._build_components(Foo, Bar)
+
+        with self.get_base() as base:
+            for __ in range(2):
+                comp = base.component(usage="speaker", lang="fr")
+                self.assertEqual("foo", comp._name)
+                comp = base.component(usage="speaker", lang="en")
+                self.assertEqual("bar", comp._name)
+        # the dynamic match of 'bar' is evaluated on every call
+        self.assertEqual(2, calls.count("foo"))
+        self.assertEqual(4, calls.count("bar"))
+
+    def test_component_match_static_override(self):
+        """A dynamic match does not inherit the flag of a static one"""
+        calls = []
+
+        class Foo(Component):
+            _name = "foo"
+            _collection = "collection.base"
+            _usage = "speaker"
+            _apply_on = ["res.partner"]
+            _static_component_match = True
+
+            @classmethod
+            def _component_match(cls, work, usage=None, model_name=None, **kw):
+                return True
+
+        class FooDynamic(Component):
+            _inherit = "foo"
+
+            @classmethod
+            def _component_match(cls, work, usage=None, model_name=None, **kw):
+                calls.append(cls._name)
+                return work.lang == "fr"
+
+        self._build_components(Foo, FooDynamic)
+
+        self.assertFalse(self.comp_registry["foo"]._has_static_component_match())
+        with self.get_base() as base:
+            base.work.lang = "fr"
+            self.assertEqual("foo", base.component(usage="speaker")._name)
+            base.work.lang = "en"
+            with self.assertRaises(NoComponentError):
+                base.component(usage="speaker")
+        self.assertEqual(2, len(calls))
@@ -182,3 +182,113 @@ class TestLookup(TransactionComponentRegistryCase):
         # now we should find them both as the cache has been cleared
         components = self.comp_registry.lookup("foobar")
         self.assertEqual(["foo", "bar"], [c._name for c in components])
+
+    def test_lookup_order(self):
+        """Lookup keeps the registration order across collections"""
+
+        class Foo(Component):
+            _name = "foo"
+            _collection = "foobar"
+            _usage = "speaker"
+
+        class Generic(Component):
+            # no collection, can be found for any collection
+            _name = "generic"
+            _usage = "speaker"
+
+        class Bar(Component):
+            _name = "bar"
+            _collection = "foobar"
+            _usage = "speaker"
+            _apply_on = ["res.partner", "res.users"]
+
+        self._build_components(Foo, Generic, Bar)
+
+        components = self.comp_registry.lookup("foobar", usage="speaker")
+        self.assertEqual(["foo", "generic", "bar"], [c._name for c in components])
+
+        components = self.comp_registry.lookup(
+            "foobar", usage="speaker", model_name="res.users"
+        )
+        self.assertEqual(["foo", "generic", "bar"], [c._name for c in components])
+
+        components = self.comp_registry.lookup(
+            "other", usage="speaker", model_name="res.country"
+        )
+        self.assertEqual(["generic"], [c._name for c in components])
+
+    def test_lookup_index_rebuilt(self):
+        """The lookup indexes follow the changes of the components"""
+
+        class Foo(Component):
+            _name = "foo"
+            _collection = "foobar"
+            _usage = "speaker"
+
+        self._build_components(Foo)
+
+        components = self.comp_registry.lookup("foobar", usage="speaker")
+        self.assertEqual(["foo"], [c._name for c in components])
+
+        # extending the component changes its usage
+        class FooListener(Component):
+            _inherit = "foo"
+            _usage = "listener"
+
+        self._build_components(FooListener)
+        self.comp_registry._cache.clear()
+
+        self.assertEqual([], self.comp_registry.lookup("foobar", usage="speaker"))
+        components = self.comp_registry.lookup("foobar", usage="listener")
+        self.assertEqual(["foo"], [c._name for c in components])
+
+    def test_lookup_frozen(self):
+        """Lookups on a frozen registry give the same results"""
+
+        class Foo(Component):
+            _name = "foo"
+            _collection = "foobar"
+            _usage = "speaker"
+            _apply_on = ["res.partner"]
+
+        class Generic(Component):
+            _name = "generic"
+            _usage = "speaker"
+
+        class Bar(Component):
+            _name = "bar"
+            _collection = "other"
+            _usage = "speaker"
+
+        self._build_components(Foo, Generic, Bar)
+
+        criteria = [
+            ("foobar", "speaker", None),
+            ("foobar", "speaker", "res.partner"),
+            ("foobar", "speaker", "res.users"),
+            ("other", "speaker", "res.partner"),
+            ("unknown", "speaker", "res.partner"),
+            (None, "speaker", None),
+            ("foobar", None, None),
+            ("foobar", "unknown", None),
+        ]
+        expected = [
+            [c._name for c in self.comp_registry.lookup(*args)] for args in criteria
+        ]
+
+        self.comp_registry.freeze()
+        for args, names in zip(criteria, expected):
+            components = self.comp_registry.lookup(*args)
+            self.assertIsInstance(components, tuple)
+            self.assertEqual(names, [c._name for c in components])
+
+        # adding a component unfreezes the registry
+        class Baz(Component):
+            _name = "baz"
+            _collection = "foobar"
+            _usage = "speaker"
+
+        self._build_components(Baz)
+        self.comp_registry._cache.clear()
+        components = self.comp_registry.lookup("foobar", usage="speaker")
+        self.assertEqual(["foo", "generic", "baz"], [c._name for c in components])
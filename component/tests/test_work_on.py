@@ -63,3 +63,23 @@ class TestWorkOn(SavepointComponentRegistryCase):
         self.assertIs(registry, work2.components_registry)
         # test_keyword has been propagated to the new WorkContext instance
         self.assertEqual("value", work2.test_keyword)
+
+    def test_propagate_work_on_reuse(self):
+        """work_on() reuses the work contexts of the same model"""
+        registry = ComponentRegistry()
+        work = WorkContext(
+            model_name="res.partner",
+            collection=self.collection,
+            components_registry=registry,
+            test_keyword="value",
+        )
+        work2 = work.work_on("res.users")
+        self.assertIs(work2, work.work_on("res.users"))
+        self.assertIsNot(work2, work.work_on("res.country"))
+
+        # a modified attribute must be propagated to a new work context
+        work.test_keyword = "other value"
+        work3 = work.work_on("res.users")
+        self.assertIsNot(work2, work3)
+        self.assertEqual("other value", work3.test_keyword)
+        self.assertEqual("value", work2.test_keyword)
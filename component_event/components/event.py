@@ -103,13 +103,17 @@ will be executed::
 An event can be skipped based on a condition evaluated from the notified
 arguments. See :func:`skip_if`
 
+An event can be deferred until the commit of the transaction, the
+notifications for the same record being coalesced. See :func:`deferred`
+
 
 """
 
 import logging
 import operator
-from collections import defaultdict
-from functools import wraps
+import weakref
+from functools import partial, wraps
+from types import MethodType
 
 # pylint: disable=W7950
 from odoo.addons.component.core import AbstractComponent, Component
@@ -121,13 +125,17 @@ try:
 except ImportError:
     _logger.debug("Cannot import 'cachetools'.")
 
-__all__ = ["skip_if"]
+__all__ = ["skip_if", "deferred", "flush_deferred_events", "drop_deferred_events"]
 
 # Number of items we keep in LRU cache when we collect the events.
 # 1 item means: for an event name, model_name, collection, return
 # the event methods
 DEFAULT_EVENT_CACHE_SIZE = 512
 
+# Events deferred until the commit, one queue per database cursor.
+# See :func:`deferred`
+_deferred_events = weakref.WeakKeyDictionary()
+
 
 def skip_if(cond):
     """Decorator allowing to skip an event based on a condition
@@ -164,6 +172,104 @@ def skip_if(cond):
     return skip_if_decorator
 
 
+def _deferred_queue(cr):
+    queue = _deferred_events.get(cr)
+    if queue is None:
+        queue = _deferred_events[cr] = {}
+        cr.precommit.add(partial(flush_deferred_events, cr))
+        cr.postrollback.add(partial(drop_deferred_events, cr))
+    return queue
+
+
+def flush_deferred_events(cr):
+    """Notify the deferred events of the transaction of ``cr``
+
+    Called automatically before the commit of the transaction. The events
+    notified by the listeners while flushing are flushed as well. The
+    records deleted since the notification are ignored, their existence is
+    checked with one query per model.
+    """
+    queue = _deferred_events.pop(cr, None)
+    while queue:
+        existing = _existing_records(record for __, record, __ in queue.values())
+        for (func, __, model_name, record_id), item in queue.items():
+            if record_id in existing[model_name]:
+                listener, record, fields = item
+                func(listener, record, fields=fields)
+        queue = _deferred_events.pop(cr, None)
+
+
+def _existing_records(records):
+    """Return the IDs of the records which still exist, by model"""
+    by_model = {}
+    for record in records:
+        by_model.setdefault(record._name, (record, []))[1].append(record.id)
+    return {
+        model_name: set(record.browse(ids).exists().ids)
+        for model_name, (record, ids) in by_model.items()
+    }
+
+
+def drop_deferred_events(cr):
+    """Forget the deferred events of the transaction of ``cr``
+
+    Called automatically on rollback. A rollback to a savepoint is not
+    detected, this function must be called in such case.
+    """
+    _deferred_events.pop(cr, None)
+
+
+def deferred(func):
+    """Decorator deferring an event until the commit of the transaction
+
+    The event must have the signature ``(record, fields=None)``, as
+    ``on_record_create`` or ``on_record_write``. Instead of being called
+    synchronously, the notifications are queued and coalesced per listener,
+    event and record, the ``fields`` of the notifications being merged
+    (``None`` meaning all the fields). Just before the commit, the listener
+    is called once per record. The queue is dropped on rollback.
+
+    Example::
+
+        @deferred
+        def on_record_write(self, record, fields=None):
+            _logger("I'll delay one job, even if the record has been "
+                    "written many times in the transaction")
+            record.with_delay().export_record(fields=fields)
+
+    When used along :func:`skip_if`, the condition is evaluated at the time
+    of the notification if :func:`skip_if` is applied on top of it.
+
+    In tests, which never commit, :func:`flush_deferred_events` can be used
+    to notify the deferred events.
+    """
+
+    @wraps(func)
+    def func_wrapper(self, record, fields=None):
+        queue = _deferred_queue(self.env.cr)
+        for single_record in record:
+            key = (func, self.__class__, single_record._name, single_record.id)
+            item = queue.get(key)
+            if item is None:
+                queue[key] = [
+                    self,
+                    single_record,
+                    None if fields is None else list(fields),
+                ]
+                continue
+            merged_fields = item[2]
+            if merged_fields is None:
+                continue
+            if fields is None:
+                item[2] = None
+            else:
+                merged_fields.extend(
+                    fname for fname in fields if fname not in merged_fields
+                )
+
+    return func_wrapper
+
+
 class CollectedEvents:
     """Event methods ready to be notified
 
@@ -191,6 +297,10 @@ class CollectedEvents:
             event(*args, **kwargs)
 
 
+# shared instance returned when an event has no listener
+NO_COLLECTED_EVENTS = CollectedEvents(())
+
+
 class EventCollecter(Component):
     """Component that collects the event from an event name
 
@@ -226,6 +336,48 @@ class EventCollecter(Component):
         # are sure that the result is always the same for a lookup
         # until the next rebuild of odoo's registry
         cls._cache = LRUCache(maxsize=DEFAULT_EVENT_CACHE_SIZE)
+        cls._listened_events = None
+
+    @classmethod
+    def _get_listened_events(cls, components_registry):
+        """Return the names of the events having listeners
+
+        Return a tuple with a set of the names of the events listened for any
+        model, and a set of ``(model_name, name)`` for the events listened
+        only on some models. The collections of the listeners are not
+        considered.
+
+        It is computed once, and again when components are added to the
+        registry, which invalidates its lookup indexes.
+        """
+        indexes = components_registry._get_indexes()
+        if cls._listened_events is None or cls._listened_events[0] is not indexes:
+            any_model_events = set()
+            model_events = set()
+            # the lookup cache of the registry is not cleared when components
+            # are added, read the indexes directly
+            listeners = components_registry._lookup(None, "event.listener", None)
+            for listener in listeners:
+                apply_on_models = listener.apply_on_models
+                for name in listener._events:
+                    if apply_on_models is None:
+                        any_model_events.add(name)
+                    else:
+                        model_events.update(
+                            (model_name, name) for model_name in apply_on_models
+                        )
+            cls._listened_events = (indexes, any_model_events, model_events)
+        return cls._listened_events[1:]
+
+    @classmethod
+    def has_listeners(cls, components_registry, model_name, name):
+        """Indicate if at least one listener may be notified for an event
+
+        When it returns False, the event can be skipped without collecting
+        the listeners.
+        """
+        any_model_events, model_events = cls._get_listened_events(components_registry)
+        return name in any_model_events or (model_name, name) in model_events
 
     def _collect_events(self, name):
         collection_name = None
@@ -235,24 +387,42 @@ class EventCollecter(Component):
 
     @cachedmethod(operator.attrgetter("_cache"))
     def _collect_events_cached(self, collection_name, model_name, name):
-        events = defaultdict(set)
+        """Return the listener classes and functions of an event
+
+        The result is a tuple of ``(listener class, function)``, in the
+        order of the lookup of the listeners.
+        """
         component_classes = self.work.components_registry.lookup(
             collection_name=collection_name,
             usage="event.listener",
             model_name=model_name,
         )
-        for cls in component_classes:
-            if cls.has_event(name):
-                events[cls].add(name)
-        return events
+        return tuple(
+            (cls, getattr(cls, name))
+            for cls in component_classes
+            if cls.has_event(name)
+        )
+
+    def _listener_instance(self, cls, listeners):
+        """Return the instance of a listener class for the work context
+
+        The instances are kept in ``listeners`` so a listener class is
+        instanciated once per work context.
+        """
+        component = listeners.get(cls)
+        if component is None:
+            component = listeners[cls] = cls(self.work)
+        return component
 
     def _init_collected_events(self, class_events):
-        events = set()
-        for cls, names in class_events.items():
-            for name in names:
-                component = cls(self.work)
-                events.add(getattr(component, name))
-        return events
+        # the work contexts of the events keep a pool of listeners
+        listeners = getattr(self.work, "_event_listeners", None)
+        if listeners is None:
+            listeners = {}
+        return [
+            MethodType(function, self._listener_instance(cls, listeners))
+            for cls, function in class_events
+        ]
 
     def collect_events(self, name):
         """Collect the events of a given name"""
@@ -52,6 +52,8 @@ class EventWorkContext(WorkContext):
             raise ValueError("collection and env cannot both be provided")
 
         self.env = env
+        # instances of the listeners, by class, see EventCollecter
+        self._event_listeners = {}
         super(EventWorkContext, self).__init__(
             model_name=model_name,
             collection=collection,
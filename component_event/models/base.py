@@ -14,7 +14,7 @@ from odoo import api, models
 
 from odoo.addons.component.core import _component_databases
 
-from ..components.event import CollectedEvents
+from ..components.event import NO_COLLECTED_EVENTS
 from ..core import EventWorkContext
 
 
@@ -29,8 +29,19 @@ class Base(models.AbstractModel):
     * ``on_record_create(self, record, fields=None)``
     * ``on_record_write(self, record, fields=none)``
     * ``on_record_unlink(self, record)``
+    * ``on_records_write(self, records, fields=None)``
+    * ``on_records_unlink(self, records)``
 
-    ``on_record_unlink`` is notified just *before* the unlink is done.
+    ``on_record_unlink`` and ``on_records_unlink`` are notified just *before*
+    the unlink is done.
+
+    The ``on_records_*`` events are notified once for all the records of
+    a call, after the events of the individual records. A listener can
+    implement them instead of the per-record events to handle the records
+    in batch, for instance to delay only one job for all of them.
+
+    The events are collected once for a call, so the listeners are
+    instantiated once and notified for every record.
 
     """
 
@@ -76,11 +87,16 @@ class Base(models.AbstractModel):
             # to be ready, and anyway we should probably not trigger events
             # during the initialization. Hence we return an empty list of
             # events, the 'notify' calls will do nothing.
-            return CollectedEvents([])
-        if not comp_registry.get("base.event.collecter"):
-            return CollectedEvents([])
+            return NO_COLLECTED_EVENTS
+        collecter_class = comp_registry.get("base.event.collecter")
+        if not collecter_class:
+            return NO_COLLECTED_EVENTS
 
         model_name = self._name
+        if not collecter_class.has_listeners(comp_registry, model_name, name):
+            # nothing to notify, avoid to build a work context and
+            # to collect the listeners
+            return NO_COLLECTED_EVENTS
         if collection is not None:
             work = EventWorkContext(
                 collection=collection,
@@ -94,26 +110,33 @@ class Base(models.AbstractModel):
                 components_registry=components_registry,
             )
 
-        collecter = work._component_class_by_name("base.event.collecter")(work)
+        collecter = collecter_class(work)
         return collecter.collect_events(name)
 
     @api.model_create_multi
     def create(self, vals_list):
         records = super(Base, self).create(vals_list)
+        events = self._event("on_record_create")
         for idx, vals in enumerate(vals_list):
             fields = list(vals.keys())
-            self._event("on_record_create").notify(records[idx], fields=fields)
+            events.notify(records[idx], fields=fields)
         return records
 
     def write(self, vals):
         result = super(Base, self).write(vals)
         fields = list(vals.keys())
+        events = self._event("on_record_write")
         for record in self:
-            self._event("on_record_write").notify(record, fields=fields)
+            events.notify(record, fields=fields)
+        if self:
+            self._event("on_records_write").notify(self, fields=fields)
         return result
 
     def unlink(self):
+        events = self._event("on_record_unlink")
         for record in self:
-            self._event("on_record_unlink").notify(record)
+            events.notify(record)
+        if self:
+            self._event("on_records_unlink").notify(self)
         result = super(Base, self).unlink()
         return result
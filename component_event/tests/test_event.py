@@ -13,7 +13,12 @@ from odoo.addons.component.tests.common import (
     ComponentRegistryCase,
     TransactionComponentRegistryCase,
 )
-from odoo.addons.component_event.components.event import skip_if
+from odoo.addons.component_event.components.event import (
+    deferred,
+    drop_deferred_events,
+    flush_deferred_events,
+    skip_if,
+)
 from odoo.addons.component_event.core import EventWorkContext
 
 
@@ -231,6 +236,34 @@ class TestEvent(ComponentRegistryCase):
             [("OK", something, fields), ("OK", something, fields)], recipient
         )
 
+    def test_collect_order(self):
+        class MyEventListener(Component):
+            _name = "my.event.listener"
+            _inherit = "base.event.listener"
+
+            def on_record_create(self, recipient):
+                recipient.append("first")
+
+        class MyOtherEventListener(Component):
+            _name = "my.other.event.listener"
+            _inherit = "base.event.listener"
+
+            def on_record_create(self, recipient):
+                recipient.append("second")
+
+        self._build_components(MyEventListener, MyOtherEventListener)
+
+        recipient = []
+        collected = self.collecter.collect_events("on_record_create")
+        collected.notify(recipient)
+        # the listeners are notified in the order of the registry
+        self.assertEqual(["first", "second"], recipient)
+
+        # the listeners are instanciated once for a work context
+        instances = [event.__self__ for event in collected.events]
+        collected = self.collecter.collect_events("on_record_create")
+        self.assertEqual(instances, [event.__self__ for event in collected.events])
+
     def test_event_cache(self):
         class MyEventListener(Component):
             _name = "my.event.listener"
@@ -447,6 +480,48 @@ class TestEventFromModel(TransactionComponentRegistryCase):
         self.assertEqual("bar", partner.name)
         self.assertEqual("bar", partner.ref)
 
+    def test_event_no_listener(self):
+        class PartnerListener(Component):
+            _name = "partner.event.listener"
+            _inherit = "base.event.listener"
+            _apply_on = ["res.partner"]
+
+            def on_foo(self, record, name):
+                record.name = name
+
+        self._build_components(PartnerListener)
+
+        partner = self.env["res.partner"].create({"name": "test"})
+        user = self.env.user
+        with mock.patch(
+            "odoo.addons.component_event.models.base.EventWorkContext"
+        ) as work_context:
+            collected = user._event("on_foo", components_registry=self.comp_registry)
+            self.assertEqual(0, len(collected.events))
+            collected = partner._event("on_bar", components_registry=self.comp_registry)
+            self.assertEqual(0, len(collected.events))
+            # nothing listens, no work context is built
+            work_context.assert_not_called()
+        partner._event("on_foo", components_registry=self.comp_registry).notify(
+            partner, "bar"
+        )
+        self.assertEqual("bar", partner.name)
+
+        # a listener added later is notified
+        class UserListener(Component):
+            _name = "user.event.listener"
+            _inherit = "base.event.listener"
+            _apply_on = ["res.users"]
+
+            def on_foo(self, record, name):
+                record.name = name
+
+        self._build_components(UserListener)
+        user._event("on_foo", components_registry=self.comp_registry).notify(
+            user, "bar"
+        )
+        self.assertEqual("bar", user.name)
+
     def test_event_filter_on_collection(self):
         class GlobalListener(Component):
             _name = "global.event.listener"
@@ -482,3 +557,115 @@ class TestEventFromModel(TransactionComponentRegistryCase):
         events.notify(partner, "bar")
         self.assertEqual("bar", partner.name)
         self.assertEqual("bar", partner.ref)
+
+    def test_event_records_write(self):
+        recipient = []
+
+        class MyEventListener(Component):
+            _name = "my.event.listener"
+            _inherit = "base.event.listener"
+
+            def on_record_write(self, record, fields=None):
+                recipient.append(("record", self, record))
+
+            def on_records_write(self, records, fields=None):
+                recipient.append(("records", self, records))
+
+        self._build_components(MyEventListener)
+
+        partners = (
+            self.env["res.partner"]
+            .with_context(components_registry=self.comp_registry)
+            .create([{"name": "test1"}, {"name": "test2"}])
+        )
+        partners.write({"ref": "foo"})
+        self.assertEqual(
+            [("record", partners[0]), ("record", partners[1]), ("records", partners)],
+            [(kind, records) for kind, __, records in recipient],
+        )
+        # the same listener instance is notified for every record
+        listeners = {
+            id(listener) for kind, listener, __ in recipient if kind == "record"
+        }
+        self.assertEqual(1, len(listeners))
+
+    def test_event_deferred(self):
+        recipient = []
+
+        class MyEventListener(Component):
+            _name = "my.event.listener"
+            _inherit = "base.event.listener"
+
+            @deferred
+            def on_record_write(self, record, fields=None):
+                recipient.append((record, fields))
+
+        self._build_components(MyEventListener)
+
+        partner = self.env["res.partner"].create({"name": "test"})
+        partner2 = self.env["res.partner"].create({"name": "test2"})
+
+        def notify(records, fields):
+            records._event(
+                "on_record_write", components_registry=self.comp_registry
+            ).notify(records, fields=fields)
+
+        notify(partner, ["name"])
+        notify(partner | partner2, ["ref", "name"])
+        notify(partner, ["email"])
+        # nothing is notified before the commit
+        self.assertEqual([], recipient)
+        flush_deferred_events(self.env.cr)
+        self.assertEqual(
+            [(partner, ["name", "ref", "email"]), (partner2, ["ref", "name"])],
+            recipient,
+        )
+
+        # None means all the fields
+        recipient.clear()
+        notify(partner, ["name"])
+        notify(partner, None)
+        notify(partner, ["ref"])
+        flush_deferred_events(self.env.cr)
+        self.assertEqual([(partner, None)], recipient)
+
+        # dropped on rollback
+        recipient.clear()
+        notify(partner, ["name"])
+        drop_deferred_events(self.env.cr)
+        flush_deferred_events(self.env.cr)
+        self.assertEqual([], recipient)
+
+    def test_event_deferred_transaction(self):
+        recipient = []
+
+        class MyEventListener(Component):
+            _name = "my.event.listener"
+            _inherit = "base.event.listener"
+
+            @deferred
+            def on_record_write(self, record, fields=None):
+                recipient.append((record, fields))
+
+        self._build_components(MyEventListener)
+
+        partner = self.env["res.partner"].create({"name": "test"})
+        partner2 = self.env["res.partner"].create({"name": "test2"})
+
+        def notify(records, fields):
+            records._event(
+                "on_record_write", components_registry=self.comp_registry
+            ).notify(records, fields=fields)
+
+        # flushed before the commit, the deleted records are ignored
+        notify(partner | partner2, ["name"])
+        partner2.unlink()
+        self.env.cr.precommit.run()
+        self.assertEqual([(partner, ["name"])], recipient)
+
+        # dropped on rollback
+        recipient.clear()
+        notify(partner, ["name"])
+        self.env.cr.postrollback.run()
+        self.env.cr.precommit.run()
+        self.assertEqual([], recipient)
@@ -55,10 +55,46 @@ class CRUDAdapter(AbstractComponent):
         """Create a record on the external system"""
         raise NotImplementedError
 
+    def create_many(self, data_list):
+        """Create many records on the external system
+
+        Returns a list with, for each record, its external ID or the
+        exception raised when it failed to be created.
+
+        Calls :meth:`create` for each record by default, to be overridden
+        when the external system has an API to create records in bulk.
+        """
+        results = []
+        for data in data_list:
+            try:
+                results.append(self.create(data))
+            except Exception as err:
+                results.append(err)
+        return results
+
     def write(self, *args, **kwargs):
         """Update records on the external system"""
         raise NotImplementedError
 
+    def write_many(self, external_ids_data):
+        """Update many records on the external system
+
+        Takes a list of ``(external_id, data)`` and returns a list with,
+        for each record, None or the exception raised when it failed to be
+        updated.
+
+        Calls :meth:`write` for each record by default, to be overridden
+        when the external system has an API to update records in bulk.
+        """
+        results = []
+        for external_id, data in external_ids_data:
+            try:
+                self.write(external_id, data)
+                results.append(None)
+            except Exception as err:
+                results.append(err)
+        return results
+
     def delete(self, *args, **kwargs):
         """Delete a record on the external system"""
         raise NotImplementedError
@@ -11,10 +11,40 @@ create the binding between them.
 
 """
 
+import weakref
+from collections import defaultdict
+from functools import partial
+
 from odoo import fields, models, tools
 
 from odoo.addons.component.core import AbstractComponent
 
+# Identity maps of the binders, one per database cursor, dropped at the end
+# of the transaction. See Binder._identity_map()
+_identity_maps = weakref.WeakKeyDictionary()
+
+
+def drop_identity_map(cr):
+    """Forget the bindings found by the binders in the transaction of ``cr``"""
+    _identity_maps.pop(cr, None)
+
+
+def forget_bindings(cr, model_name, binding_ids):
+    """Forget some bindings found by the binders in the transaction of ``cr``
+
+    Called when the fields used to find the bindings are modified.
+    """
+    identity_map = _identity_maps.get(cr)
+    if not identity_map:
+        return
+    binding_ids = set(binding_ids)
+    for key in [
+        key
+        for key, binding_id in identity_map.items()
+        if key[0] == model_name and binding_id in binding_ids
+    ]:
+        del identity_map[key]
+
 
 class Binder(AbstractComponent):
     """For one record of a model, capable to find an external or
@@ -37,6 +67,64 @@ class Binder(AbstractComponent):
     _odoo_field = "odoo_id"  # override in sub-classes
     _sync_date_field = "sync_date"  # override in sub-classes
 
+    def _identity_map(self):
+        """Return the identity map of the current transaction
+
+        The identity map keeps the IDs of the bindings found by the binders
+        in the current transaction, so repeated lookups of the same external
+        IDs or records do not hit the database again. Only the bindings
+        which have been found are kept, and the identity map is dropped on
+        commit or rollback, or when bindings are deleted. The bindings are
+        forgotten when their external ID, backend or record are written.
+        The bindings deleted by a cascade are forgotten when they are found
+        again, see :meth:`_check_identity_map`.
+
+        It is used only for the models inheriting ``external.binding``,
+        which invalidate it on ``write`` and ``unlink``. For other models,
+        an empty dict is returned and nothing is kept.
+
+        A binding created then rolled back to a savepoint is not detected,
+        :func:`drop_identity_map` must be called in such case.
+        """
+        if not isinstance(self.model, self.env.registry["external.binding"]):
+            return {}
+        cr = self.env.cr
+        identity_map = _identity_maps.get(cr)
+        if identity_map is None:
+            identity_map = _identity_maps[cr] = {}
+            cr.postcommit.add(partial(drop_identity_map, cr))
+            cr.postrollback.add(partial(drop_identity_map, cr))
+        return identity_map
+
+    def _check_identity_map(self, identity_map, key, binding_ids, missing):
+        """Forget the bindings of the identity map which do not exist
+
+        The bindings deleted without ``unlink``, by a cascade in the
+        database, are checked with one query. They are removed from
+        ``binding_ids`` and their values added to ``missing``, to be
+        searched again.
+
+        :param binding_ids: IDs of the bindings found in the identity map,
+                            by value of the field of ``key``
+        :param missing: values not found in the identity map
+        """
+        if not binding_ids:
+            return
+        existing = set(self.model.browse(list(binding_ids.values())).exists().ids)
+        for value, binding_id in list(binding_ids.items()):
+            if binding_id not in existing:
+                del binding_ids[value]
+                identity_map.pop(key + (value,), None)
+                missing.add(value)
+
+    def _identity_key(self, field_name):
+        return (
+            self.model._name,
+            self._backend_field,
+            self.backend_record.id,
+            field_name,
+        )
+
     def to_internal(self, external_id, unwrap=False):
         """Give the Odoo recordset for an external ID
 
@@ -47,23 +135,68 @@ class Binder(AbstractComponent):
         :return: a recordset, depending on the value of unwrap,
                  or an empty recordset if the external_id is not mapped
         :rtype: recordset
+
+        .. note:: It is a shortcut for :meth:`to_internal_many`, which is
+                  called directly by the batched callers (the mappers
+                  preparing many records, the generic importer, ...).
+                  Customizations of the lookup must be done in
+                  :meth:`to_internal_many`.
         """
-        context = self.env.context
-        bindings = self.model.with_context(active_test=False).search(
-            [
-                (self._external_field, "=", tools.ustr(external_id)),
-                (self._backend_field, "=", self.backend_record.id),
-            ]
-        )
-        if not bindings:
+        return self.to_internal_many([external_id], unwrap=unwrap)[external_id]
+
+    def to_internal_many(self, external_ids, unwrap=False):
+        """Give the Odoo recordsets for many external IDs
+
+        Like :meth:`to_internal`, but the bindings which are not already
+        in the identity map of the transaction are searched with a single
+        query.
+
+        :param external_ids: external IDs for which we want the Odoo IDs
+        :param unwrap: if True, returns the normal records
+                       else return the binding records
+        :return: a dict with the external IDs as keys and a recordset,
+                 depending on the value of unwrap, as values. The
+                 recordset is empty if the external_id is not mapped
+        :rtype: dict
+        """
+        identity_map = self._identity_map()
+        key = self._identity_key(self._external_field)
+        values = {external_id: tools.ustr(external_id) for external_id in external_ids}
+        binding_ids = {}
+        missing = set()
+        for value in values.values():
+            binding_id = identity_map.get(key + (value,))
+            if binding_id is None:
+                missing.add(value)
+            else:
+                binding_ids[value] = binding_id
+        self._check_identity_map(identity_map, key, binding_ids, missing)
+        if missing:
+            bindings = self.model.with_context(active_test=False).search(
+                [
+                    (self._external_field, "in", list(missing)),
+                    (self._backend_field, "=", self.backend_record.id),
+                ]
+            )
+            found = defaultdict(list)
+            for binding in bindings:
+                found[tools.ustr(binding[self._external_field])].append(binding.id)
+            for value, ids in found.items():
+                if len(ids) > 1:
+                    # several bindings for an external ID, raises an error
+                    self.model.browse(ids).ensure_one()
+                binding_ids[value] = identity_map[key + (value,)] = ids[0]
+
+        prefetch_ids = list(binding_ids.values())
+        result = {}
+        for external_id, value in values.items():
+            binding = self.model.browse(binding_ids.get(value, ())).with_prefetch(
+                prefetch_ids
+            )
             if unwrap:
-                return self.model.browse()[self._odoo_field]
-            return self.model.browse()
-        bindings.ensure_one()
-        if unwrap:
-            bindings = bindings[self._odoo_field]
-        bindings = bindings.with_context(context)
-        return bindings
+                binding = binding[self._odoo_field]
+            result[external_id] = binding
+        return result
 
     def to_external(self, binding, wrap=False):
         """Give the external ID for an Odoo binding ID
@@ -73,23 +206,83 @@ class Binder(AbstractComponent):
                      method will search the corresponding binding and return
                      the external id of the binding
         :return: external ID of the record
+
+        .. note:: With ``wrap``, it is a shortcut for
+                  :meth:`to_external_many`, which is called directly by
+                  the batched callers. Customizations of the lookup must be
+                  done in :meth:`to_external_many`.
         """
         if isinstance(binding, models.BaseModel):
             binding.ensure_one()
         else:
             binding = self.model.browse(binding)
         if wrap:
-            binding = self.model.with_context(active_test=False).search(
+            return self.to_external_many(binding, wrap=True)[binding.id]
+        return binding[self._external_field]
+
+    def to_external_many(self, bindings, wrap=False):
+        """Give the external IDs for many Odoo bindings
+
+        Like :meth:`to_external`, but the external IDs are read at once and,
+        when ``wrap`` is True, the bindings which are not already in the
+        identity map of the transaction are searched with a single query.
+
+        :param bindings: Odoo bindings (or normal records when ``wrap`` is
+                         True) for which we want the external ids, as
+                         recordset or list of IDs
+        :param wrap: if True, bindings are normal records, the
+                     method will search the corresponding bindings and return
+                     the external ids of the bindings
+        :return: a dict with the IDs of ``bindings`` as keys and the external
+                 IDs as values, None for the records without binding when
+                 ``wrap`` is True
+        :rtype: dict
+        """
+        if isinstance(bindings, models.BaseModel):
+            record_ids = bindings.ids
+        else:
+            record_ids = list(bindings)
+        if not wrap:
+            bindings = self.model.browse(record_ids)
+            return {binding.id: binding[self._external_field] for binding in bindings}
+
+        identity_map = self._identity_map()
+        key = self._identity_key(self._odoo_field)
+        binding_ids = {}
+        missing = set()
+        for record_id in record_ids:
+            binding_id = identity_map.get(key + (record_id,))
+            if binding_id is None:
+                missing.add(record_id)
+            else:
+                binding_ids[record_id] = binding_id
+        self._check_identity_map(identity_map, key, binding_ids, missing)
+        if missing:
+            bindings = self.model.with_context(active_test=False).search(
                 [
-                    (self._odoo_field, "=", binding.id),
+                    (self._odoo_field, "in", list(missing)),
                     (self._backend_field, "=", self.backend_record.id),
                 ]
             )
-            if not binding:
-                return None
-            binding.ensure_one()
-            return binding[self._external_field]
-        return binding[self._external_field]
+            found = defaultdict(list)
+            for binding in bindings:
+                found[binding[self._odoo_field].id].append(binding.id)
+            for record_id, ids in found.items():
+                if len(ids) > 1:
+                    # several bindings for a record, raises an error
+                    self.model.browse(ids).ensure_one()
+                binding_ids[record_id] = identity_map[key + (record_id,)] = ids[0]
+
+        bindings = self.model.browse(list(binding_ids.values()))
+        external_ids = {
+            binding.id: binding[self._external_field] for binding in bindings
+        }
+        return {
+            record_id: external_ids[binding_ids[record_id]]
+            if record_id in binding_ids
+            else None
+            for record_id in record_ids
+        }
 
     def bind(self, external_id, binding):
         """Create the link between an external ID and an Odoo ID
@@ -111,12 +304,113 @@ class Binder(AbstractComponent):
             binding.ensure_one()
         else:
             binding = self.model.browse(binding)
+        identity_map = self._identity_map()
+        key = self._identity_key(self._external_field)
+        # the previous external ID does not point to this binding anymore
+        identity_map.pop(key + (tools.ustr(binding[self._external_field]),), None)
         binding.with_context(connector_no_export=True).write(
             {
                 self._external_field: tools.ustr(external_id),
                 self._sync_date_field: now_fmt,
             }
         )
+        identity_map[key + (tools.ustr(external_id),)] = binding.id
+
+    def bind_many(self, bindings_external_ids):
+        """Create the links between many external IDs and Odoo IDs
+
+        Like :meth:`bind`, but the external IDs and synchronization dates
+        are updated with one SQL statement per chunk of bindings, instead of
+        one ``write`` per binding. The cache of the records is invalidated
+        and the fields depending on them are recomputed. The access rights
+        and record rules for ``write`` are checked as with ``write``. As no
+        ``write`` is done, no ``on_record_write`` event is notified, so the
+        export listeners are not triggered.
+
+        :param bindings_external_ids: list of ``(external_id, binding)``,
+                                      the bindings being records or IDs
+        :type bindings_external_ids: list
+        """
+        external_ids = {}
+        for external_id, binding in bindings_external_ids:
+            # Prevent False, None, or "", but not 0
+            assert (
+                external_id or external_id == 0
+            ) and binding, "external_id or binding missing, " "got: %s, %s" % (
+                external_id,
+                binding,
+            )
+            if isinstance(binding, models.BaseModel):
+                binding.ensure_one()
+                binding = binding.id
+            external_ids[binding] = tools.ustr(external_id)
+        if not external_ids:
+            return
+
+        bindings = self.model.browse(list(external_ids))
+        external_field = self.model._fields[self._external_field]
+        sync_date_field = self.model._fields[self._sync_date_field]
+        if not all(
+            field.store and field.column_type and not field.inherited
+            for field in (external_field, sync_date_field)
+        ):
+            # not columns of the binding table, use the ORM
+            for binding in bindings:
+                self.bind(external_ids[binding.id], binding)
+            return
+
+        # the same access rights than the write done by bind
+        bindings.check_access_rights("write")
+        bindings.check_access_rule("write")
+
+        identity_map = self._identity_map()
+        key = self._identity_key(self._external_field)
+        # the previous external IDs do not point to these bindings anymore
+        for binding in bindings:
+            identity_map.pop(key + (tools.ustr(binding[self._external_field]),), None)
+
+        fnames = [self._external_field, self._sync_date_field]
+        self.model.flush(fnames, bindings)
+        sync_date = sync_date_field.convert_to_column(fields.Datetime.now(), bindings)
+        log_access = ""
+        set_params = [sync_date]
+        if self.model._log_access:
+            log_access = ", write_uid = %s, write_date = (now() at time zone 'UTC')"
+            set_params.append(self.env.uid)
+            fnames_written = fnames + ["write_uid", "write_date"]
+        else:
+            fnames_written = fnames
+        query = """
+            UPDATE "{table}"
+            SET "{external_field}" = v.external_id,
+                "{sync_date_field}" = %s{log_access}
+            FROM (VALUES {values}) AS v(id, external_id)
+            WHERE "{table}".id = v.id
+        """
+        for chunk in tools.split_every(self.env.cr.IN_MAX, bindings.ids):
+            params = list(set_params)
+            for binding_id in chunk:
+                params.append(binding_id)
+                params.append(
+                    external_field.convert_to_column(
+                        external_ids[binding_id], bindings.browse(binding_id)
+                    )
+                )
+            self.env.cr.execute(
+                query.format(
+                    table=self.model._table,
+                    external_field=external_field.name,
+                    sync_date_field=sync_date_field.name,
+                    log_access=log_access,
+                    values=", ".join(["(%s, %s)"] * len(chunk)),
+                ),
+                params,
+            )
+        bindings.invalidate_cache(fnames_written, bindings.ids)
+        bindings.with_context(connector_no_export=True).modified(fnames)
+
+        for binding_id, external_id in external_ids.items():
+            identity_map[key + (external_id,)] = binding_id
 
     def unwrap_binding(self, binding):
         """For a binding record, gives the normal record.
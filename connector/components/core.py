@@ -71,7 +71,7 @@ single-purpose, decoupled component.
 from odoo.addons.component.core import AbstractComponent
 from odoo.addons.queue_job.exception import RetryableJobError
 
-from ..database import pg_try_advisory_lock
+from ..database import lock_namespace, pg_try_advisory_lock, pg_try_advisory_locks
 
 
 class BaseConnectorComponent(AbstractComponent):
@@ -98,7 +98,16 @@ class BaseConnectorComponent(AbstractComponent):
         """
         return self.component(usage="binder", model_name=model)
 
-    def advisory_lock_or_retry(self, lock, retry_seconds=1):
+    def advisory_lock_namespace(self, model_name=None):
+        """Return the namespace of the advisory locks for a model
+
+        The namespace is composed of the backend and the model, by default the
+        model of the component. See
+        :func:`odoo.addons.connector.database.lock_namespace`.
+        """
+        return lock_namespace(self.backend_record, model_name or self.model._name)
+
+    def advisory_lock_or_retry(self, lock, retry_seconds=1, namespace=None):
         """Acquire a Postgres transactional advisory lock or retry job
 
         When the lock cannot be acquired, it raises a
@@ -117,7 +126,19 @@ class BaseConnectorComponent(AbstractComponent):
             )
             self.advisory_lock_or_retry(lock_name, retry_seconds=2)
 
-        See :func:`odoo.addons.connector.connector.pg_try_advisory_lock` for
+        The lock is taken in the namespace of the backend and of the model
+        of the component (see :meth:`advisory_lock_namespace`), so it can
+        be found with
+        :func:`odoo.addons.connector.database.pg_connector_locks`, and the
+        name can be shorter:
+
+        .. code-block:: python
+
+            self.advisory_lock_or_retry(
+                'import_record({})'.format(self.external_id)
+            )
+
+        See :func:`odoo.addons.connector.database.pg_try_advisory_lock` for
         details.
 
         :param lock: The lock name. Can be anything convertible to a
@@ -127,10 +148,40 @@ class BaseConnectorComponent(AbstractComponent):
            external id
         :param retry_seconds: number of seconds after which a job should
            be retried when the lock cannot be acquired.
+        :param namespace: namespace of the lock, the one of
+           :meth:`advisory_lock_namespace` by default
         """
-        if not pg_try_advisory_lock(self.env, lock):
+        if namespace is None:
+            namespace = self.advisory_lock_namespace()
+        if not pg_try_advisory_lock(self.env, lock, namespace=namespace):
             raise RetryableJobError(
                 "Could not acquire advisory lock",
                 seconds=retry_seconds,
                 ignore_retry=True,
             )
+
+    def advisory_locks_or_retry(self, locks, retry_seconds=1, namespace=None):
+        """Acquire many Postgres transactional advisory locks or retry job
+
+        Like :meth:`advisory_lock_or_retry`, but all the locks are tried
+        with a single query. Either all of them are acquired, or none and
+        a :exc:`odoo.addons.queue_job.exception.RetryableJobError` is
+        raised.
+
+        See :func:`odoo.addons.connector.database.pg_try_advisory_locks` for
+        details.
+
+        :param locks: iterable of lock names
+        :param retry_seconds: number of seconds after which a job should
+           be retried when the locks cannot be acquired.
+        :param namespace: namespace of the locks, the one of
+           :meth:`advisory_lock_namespace` by default
+        """
+        if namespace is None:
+            namespace = self.advisory_lock_namespace()
+        if not pg_try_advisory_locks(self.env, locks, namespace=namespace):
+            raise RetryableJobError(
+                "Could not acquire advisory locks",
+                seconds=retry_seconds,
+                ignore_retry=True,
+            )
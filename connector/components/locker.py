@@ -8,6 +8,8 @@ import psycopg2
 from odoo.addons.component.core import Component
 from odoo.addons.connector.exception import RetryableJobError
 
+from ..database import pg_lock_timeout
+
 _logger = logging.getLogger(__name__)
 
 
@@ -18,14 +20,19 @@ class RecordLocker(Component):
 
         self.component('record.locker').lock(self.records)
 
-    See the definition of :meth:`~lock` for details.
+    See the definition of :meth:`~lock` for details, and :meth:`~lock_available`
+    to lock only the records which are not locked by another transaction.
     """
 
     _name = "base.record.locker"
     _inherit = ["base.connector"]
     _usage = "record.locker"
 
-    def lock(self, records, seconds=None, ignore_retry=True):
+    #: maximum time in seconds to wait for the records locked by concurrent
+    #: transactions, the lock uses ``NOWAIT`` when empty
+    _lock_timeout = 0.3
+
+    def lock(self, records, seconds=None, ignore_retry=True, lock_timeout=None):
         """Lock the records.
 
         Lock the record so we are sure that only one job is running for this
@@ -35,9 +42,11 @@ class RecordLocker(Component):
         retried later
         (:exc:`~odoo.addons.queue_job.exception.RetryableJobError` is raised).
 
-        The lock is using a ``FOR UPDATE NOWAIT`` so any concurrent transaction
-        trying FOR UPDATE/UPDATE will be rejected until the current transaction
-        is committed or rollbacked.
+        The lock is using a ``FOR UPDATE`` waiting at most ``_lock_timeout``
+        seconds (see :func:`~odoo.addons.connector.database.pg_lock_timeout`),
+        or a ``FOR UPDATE NOWAIT`` when no timeout is set, so any concurrent
+        transaction trying FOR UPDATE/UPDATE will be rejected until the current
+        transaction is committed or rollbacked.
 
         A classical use case for this is to prevent concurrent exports.
 
@@ -49,10 +58,17 @@ class RecordLocker(Component):
                         the queue_job configuration is used.
         :param ignore_retry: If True, the retry counter of the job will not be
                              increased.
+        :param lock_timeout: maximum time in seconds to wait for the lock,
+                             overrides ``_lock_timeout``, 0 to use ``NOWAIT``
         """
-        sql = "SELECT id FROM %s WHERE ID IN %%s FOR UPDATE NOWAIT" % self.model._table
+        if lock_timeout is None:
+            lock_timeout = self._lock_timeout
+        sql = "SELECT id FROM %s WHERE ID IN %%s FOR UPDATE" % self.model._table
+        if not lock_timeout:
+            sql += " NOWAIT"
         try:
-            self.env.cr.execute(sql, (tuple(records.ids),), log_exceptions=False)
+            with pg_lock_timeout(self.env.cr, lock_timeout, name=self.model._name):
+                self.env.cr.execute(sql, (tuple(records.ids),), log_exceptions=False)
         except psycopg2.OperationalError:
             _logger.info(
                 "A concurrent job is already working on the same "
@@ -67,3 +83,37 @@ class RecordLocker(Component):
                 seconds=seconds,
                 ignore_retry=ignore_retry,
             )
+
+    def lock_available(self, records):
+        """Lock the records which are not locked by concurrent transactions
+
+        Contrarily to :meth:`lock`, the lock is using a ``FOR UPDATE SKIP
+        LOCKED``: the records already locked by another transaction are
+        skipped instead of failing for all the records. The caller works on
+        the records which have been locked, and retries later the others.
+
+        Example of usage::
+
+            locked = self.component('record.locker').lock_available(records)
+            busy = records - locked
+
+        :param records: records to lock
+        :return: the records which have been locked, in the order of
+                 ``records``
+        """
+        if not records:
+            return records
+        sql = (
+            "SELECT id FROM %s WHERE ID IN %%s FOR UPDATE SKIP LOCKED"
+            % self.model._table
+        )
+        self.env.cr.execute(sql, (tuple(records.ids),))
+        locked_ids = {row[0] for row in self.env.cr.fetchall()}
+        if len(locked_ids) < len(set(records.ids)):
+            _logger.info(
+                "Concurrent jobs are already working on some of the records "
+                "(%s with ids in %s), they are skipped.",
+                self.model._name,
+                tuple(set(records.ids) - locked_ids),
+            )
+        return records.browse([rid for rid in records.ids if rid in locked_ids])
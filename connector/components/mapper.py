@@ -11,9 +11,13 @@ external records into Odoo records and conversely.
 
 """
 
+import hashlib
 import logging
+import weakref
 from collections import namedtuple
+from collections.abc import Mapping
 from contextlib import contextmanager
+from functools import partial
 
 from odoo import models
 
@@ -24,6 +28,31 @@ from ..exception import MappingError
 
 _logger = logging.getLogger(__name__)
 
+try:
+    from cachetools import LRUCache
+except ImportError:
+    _logger.debug("Cannot import 'cachetools'.")
+
+# Number of mapping plans we keep in LRU cache per Mapper class.
+# 1 item means: for the fields and for_create options, return
+# the mappings to apply
+DEFAULT_MAPPING_PLAN_CACHE_SIZE = 128
+
+# Number of mapped values we keep in LRU cache per transaction
+# when the memoization is activated (see Mapper._memoize).
+# 1 item means: for a mapper, a backend, a record, its fingerprint and the
+# options, return the mapped values
+DEFAULT_MEMOIZE_CACHE_SIZE = 1024
+
+# Values memoized by the mappers, one LRU cache per database cursor,
+# dropped at the end of the transaction. See Mapper._memoized_values()
+_memoized_values = weakref.WeakKeyDictionary()
+
+
+def drop_memoized_values(cr):
+    """Forget the values memoized by the mappers in the transaction of ``cr``"""
+    _memoized_values.pop(cr, None)
+
 
 __all__ = [
     "Mapper",
@@ -38,6 +67,7 @@ __all__ = [
     "external_to_m2o",
     "follow_m2o_relations",
     "MapRecord",
+    "ColumnsRow",
     "MapChild",
     "ImportMapChild",
     "ExportMapChild",
@@ -134,6 +164,17 @@ def none(field):
             return None
         return result
 
+    def map_column(self, columns, to_attr):
+        if callable(field):
+            values = field.map_column(self, columns, to_attr)
+        else:
+            values = columns[field]
+        return [value or None for value in values]
+
+    if callable(field) and getattr(field, "prefetch", None):
+        modifier.prefetch = field.prefetch
+    if not callable(field) or getattr(field, "map_column", None):
+        modifier.map_column = map_column
     return modifier
 
 
@@ -156,6 +197,10 @@ def convert(field, conv_type):
             return False
         return conv_type(value)
 
+    def map_column(self, columns, to_attr):
+        return [conv_type(value) if value else False for value in columns[field]]
+
+    modifier.map_column = map_column
     return modifier
 
 
@@ -204,6 +249,22 @@ def m2o_to_external(field, binding=None):
             )
         return value
 
+    def prefetch(self, records, to_attr):
+        # find the external IDs of all the records at once, the binder
+        # keeps them for the calls of the modifier
+        column = self.model._fields[field]
+        if column.type != "many2one":
+            return
+        rel_ids = list(
+            dict.fromkeys(record[field].id for record in records if record[field])
+        )
+        if not rel_ids:
+            return
+        binding_model = column.comodel_name if binding is None else binding
+        binder = self.binder_for(binding_model)
+        binder.to_external_many(rel_ids, wrap=bool(binding))
+
+    modifier.prefetch = prefetch
     return modifier
 
 
@@ -263,6 +324,48 @@ def external_to_m2o(field, binding=None):
             )
             return record
 
+    def prefetch(self, records, to_attr):
+        # find the bindings of all the records at once, the binder
+        # keeps them for the calls of the modifier
+        column = self.model._fields[to_attr]
+        if column.type != "many2one":
+            return
+        external_ids = list(
+            dict.fromkeys(record[field] for record in records if record[field])
+        )
+        if not external_ids:
+            return
+        binding_model = column.comodel_name if binding is None else binding
+        binder = self.binder_for(binding_model)
+        binder.to_internal_many(external_ids, unwrap=bool(binding))
+
+    def map_column(self, columns, to_attr):
+        column = self.model._fields[to_attr]
+        if column.type != "many2one":
+            raise ValueError(
+                "The column {} should be a Many2one, got {}".format(
+                    to_attr, type(column)
+                )
+            )
+        values = columns[field]
+        external_ids = list(dict.fromkeys(value for value in values if value))
+        if not external_ids:
+            return [False] * len(values)
+        binding_model = column.comodel_name if binding is None else binding
+        binder = self.binder_for(binding_model)
+        unwrap = bool(binding)
+        records = binder.to_internal_many(external_ids, unwrap=unwrap)
+        for rel_id, record in records.items():
+            if not record:
+                raise MappingError(
+                    "Can not find an existing %s for external "
+                    "record %s %s unwrapping"
+                    % (binding_model, rel_id, "with" if unwrap else "without")
+                )
+        return [records[value].id if value else False for value in values]
+
+    modifier.prefetch = prefetch
+    modifier.map_column = map_column
     return modifier
 
 
@@ -292,6 +395,9 @@ def follow_m2o_relations(field):
 
 MappingDefinition = namedtuple("MappingDefinition", ["changed_by", "only_create"])
 
+# Mappings applied by a Mapper for some options, see Mapper._get_mapping_plan
+MappingPlan = namedtuple("MappingPlan", ["direct", "methods", "children"])
+
 
 class MapChild(AbstractComponent):
     """MapChild is responsible to convert items.
@@ -340,9 +446,50 @@ class MapChild(AbstractComponent):
     _name = "base.map.child"
     _inherit = "base.connector"
 
+    def __init__(self, work):
+        super(MapChild, self).__init__(work)
+        # mapper of the items, see _get_child_mapper
+        self._mapper = None
+
     def _child_mapper(self):
         raise NotImplementedError
 
+    def _get_child_mapper(self):
+        """Return the :py:class:`Mapper` of the items
+
+        It is looked up once for the MapChild.
+        """
+        if self._mapper is None:
+            self._mapper = self._child_mapper()
+        return self._mapper
+
+    def prefetch_items(self, parent_items, options):
+        """Prepare the mapping of many items
+
+        Called with the items of all the parent records mapped by
+        :py:meth:`Mapper.map_records`. The items skipped by
+        :py:meth:`skip_item` are not prepared.
+
+        :param parent_items: list of ``(parent, items)``, ``parent`` being
+                             the :py:class:`MapRecord` of the parent record
+                             and ``items`` the list of its item records
+        :param options: dict of options, herited from the main mapper
+        """
+        mapper = self._get_child_mapper()
+        to_apply = []
+        for parent, items in parent_items:
+            to_apply += self._items_to_apply(mapper, items, parent)
+        if to_apply:
+            mapper._prefetch(to_apply, options)
+
+    def _items_to_apply(self, mapper, items, parent):
+        """Return the items not skipped by :py:meth:`skip_item`"""
+        return [
+            item
+            for item in items
+            if not self.skip_item(mapper.map_record(item, parent=parent))
+        ]
+
     def skip_item(self, map_record):
         """Hook to implement in sub-classes when some child
         records should be skipped.
@@ -358,6 +505,11 @@ class MapChild(AbstractComponent):
     def get_items(self, items, parent, to_attr, options):
         """Returns the formatted output values of items from a main record
 
+        The relations of the items which are not skipped are resolved with
+        one call to the binders before they are mapped. The items are then
+        mapped one by one while :py:meth:`format_items_stream` consumes
+        their values.
+
         :param items: list of item records
         :type items: list
         :param parent: parent record
@@ -368,16 +520,21 @@ class MapChild(AbstractComponent):
         :return: formatted output values for the item
 
         """
-        mapper = self._child_mapper()
-        mapped = []
+        mapper = self._get_child_mapper()
+        to_apply = self._items_to_apply(mapper, items, parent)
+        if to_apply:
+            mapper._prefetch(to_apply, options)
+        return self.format_items_stream(
+            self._iter_items_values(mapper, to_apply, parent, to_attr, options)
+        )
+
+    def _iter_items_values(self, mapper, items, parent, to_attr, options):
+        """Map the items one by one and yield their values"""
         for item in items:
             map_record = mapper.map_record(item, parent=parent)
-            if self.skip_item(map_record):
-                continue
             item_values = self.get_item_values(map_record, to_attr, options)
             if item_values:
-                mapped.append(item_values)
-        return self.format_items(mapped)
+                yield item_values
 
     def get_item_values(self, map_record, to_attr, options):
         """Get the raw values from the child Mappers for the items.
@@ -416,6 +573,20 @@ class MapChild(AbstractComponent):
         """
         return items_values
 
+    def format_items_stream(self, items_values):
+        """Format the values of the items, given as an iterator
+
+        By default, the values are collected in a list and given to
+        :py:meth:`format_items`. It can be overridden to format the values
+        one by one while they are mapped, without keeping them all, when
+        :py:meth:`format_items` is not overridden.
+
+        :param items_values: mapped values for the items
+        :type items_values: iterator
+        :return: formatted values
+        """
+        return self.format_items(list(items_values))
+
 
 class ImportMapChild(AbstractComponent):
     """:py:class:`MapChild` for the Imports"""
@@ -438,12 +609,22 @@ class ImportMapChild(AbstractComponent):
         :py:meth:`get_item_values` then use the ``(1, ID, {values}``)
         command
 
-        :param items_values: list of values for the items to create
+        :param items_values: values for the items to create
         :type items_values: list
 
         """
         return [(0, 0, values) for values in items_values]
 
+    def format_items_stream(self, items_values):
+        """Format the values of the items while they are mapped
+
+        Only the list of commands is built, unless :py:meth:`format_items`
+        is overridden, it is then given the list of the values.
+        """
+        if type(self).format_items is not ImportMapChild.format_items:
+            return super(ImportMapChild, self).format_items_stream(items_values)
+        return [(0, 0, values) for values in items_values]
+
 
 class ExportMapChild(AbstractComponent):
     """:py:class:`MapChild` for the Exports"""
@@ -556,6 +737,7 @@ class Mapper(AbstractComponent):
         >>> values = map_record.values()
         >>> values = map_record.values(for_create=True)
         >>> values = map_record.values(fields=['name', 'street'])
+        >>> values_list = mapper.map_records(records, for_create=True)
 
     """
 
@@ -571,6 +753,14 @@ class Mapper(AbstractComponent):
     _map_child_usage = None
     _map_child_fallback = None
 
+    #: keep the values mapped from the Odoo records during the transaction,
+    #: and return them again as long as the fingerprint of the record (see
+    #: :py:meth:`fingerprint`) and the options are the same. Only safe when
+    #: the values depend only on the ``direct`` fields, the ``changed_by`` of
+    #: the mapping methods and the external IDs of relations which are not
+    #: bound later in the transaction. Not used by mappers with ``children``.
+    _memoize = False
+
     @classmethod
     def _build_mapper_component(cls):
         """Build a Mapper component
@@ -647,10 +837,15 @@ class Mapper(AbstractComponent):
     def _complete_component_build(cls):
         super(Mapper, cls)._complete_component_build()
         cls._build_mapper_component()
+        # the plans only depend on the class, which is rebuilt
+        # with the registry
+        cls._mapping_plans = LRUCache(maxsize=DEFAULT_MAPPING_PLAN_CACHE_SIZE)
 
     def __init__(self, work):
         super(Mapper, self).__init__(work)
         self._options = None
+        # MapChild components by model, see _get_map_child_component
+        self._map_child_components = {}
 
     def _map_direct(self, record, from_attr, to_attr):
         """Apply the ``direct`` mappings.
@@ -663,6 +858,27 @@ class Mapper(AbstractComponent):
         """
         raise NotImplementedError
 
+    def _compile_direct(self, from_attr, to_attr):
+        """Return the function applying a ``direct`` mapping
+
+        Called once when a plan is compiled, so the decisions which do not
+        depend on the record, as the type of the fields, are not taken for
+        every record. The function has the same signature than the
+        modifiers: ``(mapper, record, to_attr)``.
+
+        The default implementation calls :py:meth:`_map_direct`.
+
+        :param from_attr: name of the source attribute or a callable
+        :type from_attr: callable | str
+        :param to_attr: name of the target attribute
+        :type to_attr: str
+        """
+
+        def map_direct(mapper, record, to_attr):
+            return mapper._map_direct(record, from_attr, to_attr)
+
+        return map_direct
+
     def _map_children(self, record, attr, model):
         raise NotImplementedError
 
@@ -673,6 +889,9 @@ class Mapper(AbstractComponent):
             yield getattr(self, meth), definition
 
     def _get_map_child_component(self, model_name):
+        mapper_child = self._map_child_components.get(model_name)
+        if mapper_child is not None:
+            return mapper_child
         try:
             mapper_child = self.component(
                 usage=self._map_child_usage, model_name=model_name
@@ -684,6 +903,8 @@ class Mapper(AbstractComponent):
             mapper_child = self.component_by_name(
                 self._map_child_fallback, model_name=model_name
             )
+        # looked up once for the mapper, the items of all the records use it
+        self._map_child_components[model_name] = mapper_child
         return mapper_child
 
     def _map_child(self, map_record, from_attr, to_attr, model_name):
@@ -731,6 +952,74 @@ class Mapper(AbstractComponent):
             changed_by |= method_def.changed_by
         return changed_by
 
+    def fingerprint(self, record):
+        """Return a fingerprint of the values used to map a record
+
+        The fingerprint is a hash of the values of the fields returned by
+        :py:meth:`changed_by_fields`. As long as it does not change, the
+        mapped values are expected to be the same, except when the values
+        depend on other data, for instance mapping methods without
+        ``changed_by``, the items of the ``children`` or the external IDs
+        of the relations.
+
+        It can be stored, for instance on the binding, to know if a record
+        has to be exported again.
+
+        :param record: Odoo record or backend record
+        :return: hexadecimal hash
+        :rtype: str
+        """
+        values = []
+        for fieldname in sorted(self.changed_by_fields()):
+            if isinstance(record, models.BaseModel):
+                record.ensure_one()
+                value = record.mapped(fieldname)
+                if isinstance(value, models.BaseModel):
+                    value = value.ids
+            else:
+                value = record.get(fieldname)
+            values.append((fieldname, value))
+        return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+    def _memoize_key(self, map_record, options):
+        """Return the key of the mapped values of a record in the cache
+
+        Return None when the values cannot be memoized.
+        """
+        source = map_record.source
+        if (
+            map_record.parent is not None
+            or self.children
+            or not isinstance(source, models.BaseModel)
+            or len(source) != 1
+        ):
+            # the values of the children are not in the fingerprint
+            return None
+        return (
+            self._name,
+            self.backend_record._name,
+            self.backend_record.id,
+            source._name,
+            source.id,
+            self.fingerprint(source),
+            repr(sorted(options.items())),
+        )
+
+    def _memoized_values(self):
+        """Return the values memoized in the current transaction
+
+        The memoized values are dropped on commit or rollback, so the
+        changes of the data which are not in the fingerprint (external IDs
+        of the relations, ...) are seen by the next transactions.
+        """
+        cr = self.env.cr
+        memo = _memoized_values.get(cr)
+        if memo is None:
+            memo = _memoized_values[cr] = LRUCache(maxsize=DEFAULT_MEMOIZE_CACHE_SIZE)
+            cr.postcommit.add(partial(drop_memoized_values, cr))
+            cr.postrollback.add(partial(drop_memoized_values, cr))
+        return memo
+
     def _direct_source_field_name(self, direct_entry):
         """Get the mapping field name. Goes through the function modifiers.
 
@@ -761,6 +1050,70 @@ class Mapper(AbstractComponent):
                 fieldname = cells["field"]
         return fieldname
 
+    def _compile_mapping_plan(self, fields, for_create):
+        """Compute the mappings to apply for the given options
+
+        The source field names of the ``direct`` mappings are resolved, the
+        functions applying them are prepared (see :py:meth:`_compile_direct`)
+        and the mapping methods and ``children`` are filtered on ``fields``
+        and ``for_create``.
+
+        :param fields: filter on fields, all the mappings when empty
+        :param for_create: True if the ``@only_create`` mappings apply
+        :rtype: :py:class:`MappingPlan`
+        """
+        direct = []
+        for from_attr, to_attr in self.direct:
+            if callable(from_attr):
+                attr_name = self._direct_source_field_name(from_attr)
+            else:
+                attr_name = from_attr
+            if not fields or attr_name in fields:
+                direct.append(
+                    (from_attr, to_attr, self._compile_direct(from_attr, to_attr))
+                )
+
+        methods = []
+        for attr_name, definition in self._map_methods.items():
+            mapping_changed_by = definition.changed_by
+            if (
+                fields
+                and mapping_changed_by
+                and not mapping_changed_by.intersection(fields)
+            ):
+                continue
+            if definition.only_create and not for_create:
+                continue
+            methods.append(getattr(type(self), attr_name))
+
+        children = [
+            (from_attr, to_attr, model_name)
+            for from_attr, to_attr, model_name in self.children
+            if not fields or from_attr in fields
+        ]
+        return MappingPlan(tuple(direct), tuple(methods), tuple(children))
+
+    def _get_mapping_plan(self):
+        """Return the mappings to apply for the current options
+
+        The plans are computed once per class for the model and the
+        ``fields`` and ``for_create`` options, unless ``direct`` or
+        ``children`` are properties, which may depend on the instance.
+        """
+        fields = self.options.fields
+        for_create = bool(self.options.for_create)
+        cls = type(self)
+        if isinstance(getattr(cls, "direct", None), property) or isinstance(
+            getattr(cls, "children", None), property
+        ):
+            return self._compile_mapping_plan(fields, for_create)
+        key = (self.work.model_name, frozenset(fields) if fields else None, for_create)
+        plan = cls._mapping_plans.get(key)
+        if plan is None:
+            plan = self._compile_mapping_plan(fields, for_create)
+            cls._mapping_plans[key] = plan
+        return plan
+
     def map_record(self, record, parent=None):
         """Get a :py:class:`MapRecord` with record, ready to be
         converted using the current Mapper.
@@ -771,6 +1124,87 @@ class Mapper(AbstractComponent):
         """
         return MapRecord(self, record, parent=parent)
 
+    def _prefetch_direct(self, records, from_attr, to_attr):
+        """Prepare a ``direct`` mapping for many records
+
+        Called by :py:meth:`map_records` before the records are mapped.
+        The modifiers having a ``prefetch`` attribute, as
+        :py:func:`m2o_to_external` and :py:func:`external_to_m2o`, use it
+        to find the external IDs or bindings of all the records at once.
+
+        :param records: records to convert from a source to a target
+        :param from_attr: name of the source attribute or a callable
+        :type from_attr: callable | str
+        :param to_attr: name of the target attribute
+        :type to_attr: str
+        """
+        prefetch = getattr(from_attr, "prefetch", None)
+        if prefetch:
+            prefetch(self, records, to_attr)
+
+    def _prefetch(self, records, options):
+        """Prepare the ``direct`` mappings for many records
+
+        The items of the ``children`` of all the records are prepared
+        together as well.
+        """
+        with self._mapping_options(options):
+            plan = self._get_mapping_plan()
+            for from_attr, to_attr, __ in plan.direct:
+                self._prefetch_direct(records, from_attr, to_attr)
+            parents = None
+            for from_attr, __, model_name in plan.children:
+                if parents is None:
+                    parents = [self.map_record(record) for record in records]
+                parent_items = [
+                    (parent, parent.source[from_attr])
+                    for parent in parents
+                    if parent.source[from_attr]
+                ]
+                if parent_items:
+                    mapper_child = self._get_map_child_component(model_name)
+                    mapper_child.prefetch_items(parent_items, options)
+
+    def prefetch_records(self, records, **options):
+        """Prepare the mapping of many records
+
+        Resolve the relations of the ``direct`` mappings of all the records,
+        and of the items of their ``children``, with one call to the
+        binders, so the records can then be mapped one by one with
+        :py:meth:`map_record` without querying the binders again.
+
+        :param records: records to transform, a list of backend records
+                        for the imports, a recordset for the exports
+        :param ``**options``: options of the mapping, see
+                              :py:meth:`MapRecord.values`
+        """
+        self._prefetch(records, MapOptions(**options))
+
+    def map_records(self, records, parent=None, **options):
+        """Map many records and return their values
+
+        It is equivalent to calling ``map_record(record).values(**options)``
+        for each record, but the relations of the ``direct`` mappings
+        are resolved with one call to the binders for all the records,
+        instead of one call per record. It applies to the items of the
+        ``children`` of all the records as well.
+
+        :param records: records to transform, a list of backend records
+                        for the imports, a recordset for the exports
+        :param parent: optional parent record, for items
+        :param ``**options``: options of the mapping, see
+                              :py:meth:`MapRecord.values`
+        :return: list of mapped values, in the order of the records
+        :rtype: list
+        """
+        if not isinstance(records, models.BaseModel):
+            records = list(records)
+        self.prefetch_records(records, **options)
+        return [
+            self.map_record(record, parent=parent).values(**options)
+            for record in records
+        ]
+
     def _apply(self, map_record, options=None):
         """Apply the mappings on a :py:class:`MapRecord`
 
@@ -780,8 +1214,16 @@ class Mapper(AbstractComponent):
         """
         if options is None:
             options = {}
+        key = self._memoize_key(map_record, options) if self._memoize else None
+        if key is not None:
+            values = self._memoized_values().get(key)
+            if values is not None:
+                return dict(values)
         with self._mapping_options(options):
-            return self._apply_with_options(map_record)
+            values = self._apply_with_options(map_record)
+        if key is not None:
+            self._memoized_values()[key] = dict(values)
+        return values
 
     def _apply_with_options(self, map_record):
         """Apply the mappings on a :py:class:`MapRecord` with
@@ -798,43 +1240,40 @@ class Mapper(AbstractComponent):
         ), "options should be defined with '_mapping_options'"
         _logger.debug("converting record %s to model %s", map_record.source, self.model)
 
-        fields = self.options.fields
-        for_create = self.options.for_create
+        plan = self._get_mapping_plan()
+        source = map_record.source
         result = {}
-        for from_attr, to_attr in self.direct:
-            if callable(from_attr):
-                attr_name = self._direct_source_field_name(from_attr)
-            else:
-                attr_name = from_attr
-
-            if not fields or attr_name in fields:
-                value = self._map_direct(map_record.source, from_attr, to_attr)
-                result[to_attr] = value
+        for __, to_attr, map_direct in plan.direct:
+            result[to_attr] = map_direct(self, source, to_attr)
+        return self._apply_plan(map_record, plan, result)
 
-        for meth, definition in self.map_methods:
-            mapping_changed_by = definition.changed_by
-            if (
-                not fields
-                or not mapping_changed_by
-                or mapping_changed_by.intersection(fields)
-            ):
-                if definition.only_create and not for_create:
-                    continue
-                values = meth(map_record.source)
-                if not values:
-                    continue
-                if not isinstance(values, dict):
-                    raise ValueError(
-                        "%s: invalid return value for the "
-                        "mapping method %s" % (values, meth)
-                    )
-                result.update(values)
+    def _apply_plan(self, map_record, plan, result):
+        """Apply the mapping methods and the children of a plan
 
-        for from_attr, to_attr, model_name in self.children:
-            if not fields or from_attr in fields:
-                result[to_attr] = self._map_child(
-                    map_record, from_attr, to_attr, model_name
+        :param map_record: source record to convert
+        :type map_record: :py:class:`MapRecord`
+        :param plan: plan returned by :py:meth:`_get_mapping_plan`
+        :param result: values of the ``direct`` mappings, updated with
+                       the values of the other mappings
+        :returns: mapped values, after :py:meth:`finalize`
+        :rtype: dict
+        """
+        source = map_record.source
+        for meth in plan.methods:
+            values = meth(self, source)
+            if not values:
+                continue
+            if not isinstance(values, dict):
+                raise ValueError(
+                    "%s: invalid return value for the "
+                    "mapping method %s" % (values, meth)
                 )
+            result.update(values)
+
+        for from_attr, to_attr, model_name in plan.children:
+            result[to_attr] = self._map_child(
+                map_record, from_attr, to_attr, model_name
+            )
 
         return self.finalize(map_record, result)
 
@@ -893,6 +1332,122 @@ class ImportMapper(AbstractComponent):
             value = mapping_func(self, record, to_attr)
         return value
 
+    def _compile_direct(self, from_attr, to_attr):
+        if type(self)._map_direct is not ImportMapper._map_direct:
+            # _map_direct is customized
+            return super(ImportMapper, self)._compile_direct(from_attr, to_attr)
+        if callable(from_attr):
+            return from_attr
+        field = self.model._fields.get(to_attr)
+        if field is None:
+            return super(ImportMapper, self)._compile_direct(from_attr, to_attr)
+
+        if field.type == "many2one":
+            # Backward compatibility: see _map_direct
+            modifier = external_to_m2o(from_attr)
+
+            def map_direct(mapper, record, to_attr):
+                if not record.get(from_attr):
+                    return False
+                return modifier(mapper, record, to_attr)
+
+        else:
+
+            def map_direct(mapper, record, to_attr):
+                return record.get(from_attr) or False
+
+        return map_direct
+
+    def _prefetch_direct(self, records, from_attr, to_attr):
+        if not callable(from_attr):
+            field = self.model._fields.get(to_attr)
+            if field is None or field.type != "many2one":
+                return
+            # implicit modifier, see _map_direct
+            records = [record for record in records if record.get(from_attr)]
+            from_attr = external_to_m2o(from_attr)
+        super(ImportMapper, self)._prefetch_direct(records, from_attr, to_attr)
+
+    def _map_direct_column(self, columns, size, from_attr, to_attr):
+        """Apply a ``direct`` mapping on columns
+
+        The modifiers having a ``map_column`` attribute, as
+        :py:func:`convert`, :py:func:`none` and :py:func:`external_to_m2o`,
+        are applied on the whole column, the other ones are applied on each
+        row.
+
+        :param columns: source columns, by name
+        :type columns: dict
+        :param size: number of rows
+        :param from_attr: name of the source attribute or a callable
+        :type from_attr: callable | str
+        :param to_attr: name of the target attribute
+        :type to_attr: str
+        :return: values of the target attribute, one per row
+        :rtype: list
+        """
+        if type(self)._map_direct is not ImportMapper._map_direct:
+            # _map_direct is customized, it is applied on each row
+            return [
+                self._map_direct(ColumnsRow(columns, index), from_attr, to_attr)
+                for index in range(size)
+            ]
+        if callable(from_attr):
+            map_column = getattr(from_attr, "map_column", None)
+            if map_column:
+                return map_column(self, columns, to_attr)
+            return [
+                from_attr(self, ColumnsRow(columns, index), to_attr)
+                for index in range(size)
+            ]
+
+        values = columns.get(from_attr)
+        if values is None or not any(values):
+            return [False] * size
+        # Backward compatibility: see _map_direct
+        field = self.model._fields[to_attr]
+        if field.type == "many2one":
+            return external_to_m2o(from_attr).map_column(self, columns, to_attr)
+        return [value if value else False for value in values]
+
+    def map_columns(self, columns, **options):
+        """Map records given as columns and return their values
+
+        The backend records are given as a dict with the name of the source
+        fields as keys and lists of values, one per record, as values::
+
+            >>> mapper.map_columns({'name': ['A', 'B'], 'code': [1, 2]})
+            [{'name': 'A', 'code': 1}, {'name': 'B', 'code': 2}]
+
+        The ``direct`` mappings are applied column by column (see
+        :py:meth:`_map_direct_column`), without building a dict per record.
+        The mapping methods and the children receive a
+        :py:class:`ColumnsRow`, a read-only view of a row.
+
+        :param columns: source columns, by name
+        :type columns: dict
+        :param ``**options``: options of the mapping, see
+                              :py:meth:`MapRecord.values`
+        :return: list of mapped values, in the order of the rows
+        :rtype: list
+        """
+        sizes = {len(values) for values in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All the columns must have the same length")
+        size = sizes.pop() if sizes else 0
+        with self._mapping_options(MapOptions(**options)):
+            plan = self._get_mapping_plan()
+            direct = [
+                (to_attr, self._map_direct_column(columns, size, from_attr, to_attr))
+                for from_attr, to_attr, __ in plan.direct
+            ]
+            result = []
+            for index in range(size):
+                map_record = self.map_record(ColumnsRow(columns, index))
+                values = {to_attr: column[index] for to_attr, column in direct}
+                result.append(self._apply_plan(map_record, plan, values))
+        return result
+
 
 class ExportMapper(AbstractComponent):
     """:py:class:`Mapper` for exports.
@@ -934,6 +1489,40 @@ class ExportMapper(AbstractComponent):
             value = mapping_func(self, record, to_attr)
         return value
 
+    def _compile_direct(self, from_attr, to_attr):
+        if type(self)._map_direct is not ExportMapper._map_direct:
+            # _map_direct is customized
+            return super(ExportMapper, self)._compile_direct(from_attr, to_attr)
+        if callable(from_attr):
+            return from_attr
+        field = self.model._fields.get(from_attr)
+        if field is None:
+            return super(ExportMapper, self)._compile_direct(from_attr, to_attr)
+
+        if field.type == "many2one":
+            # Backward compatibility: see _map_direct
+            modifier = m2o_to_external(from_attr)
+
+            def map_direct(mapper, record, to_attr):
+                if not record[from_attr]:
+                    return False
+                return modifier(mapper, record, to_attr)
+
+        else:
+
+            def map_direct(mapper, record, to_attr):
+                return record[from_attr] or False
+
+        return map_direct
+
+    def _prefetch_direct(self, records, from_attr, to_attr):
+        if not callable(from_attr):
+            field = self.model._fields.get(from_attr)
+            if field is not None and field.type == "many2one":
+                # implicit modifier, see _map_direct
+                from_attr = m2o_to_external(from_attr)
+        super(ExportMapper, self)._prefetch_direct(records, from_attr, to_attr)
+
 
 class MapRecord:
     """A record prepared to be converted using a :py:class:`Mapper`.
@@ -1032,6 +1621,33 @@ class MapRecord:
         self._forced_values.update(*args, **kwargs)
 
 
+class ColumnsRow(Mapping):
+    """Read-only view of a row of columns
+
+    Used as source record by :py:meth:`ImportMapper.map_columns`,
+    it can be used as the dict of a backend record.
+
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._columns[key][self._index]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __repr__(self):
+        return "ColumnsRow(%r)" % dict(self)
+
+
 class MapOptions(dict):
     """Container for the options of mappings.
 
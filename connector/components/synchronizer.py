@@ -15,16 +15,22 @@ systems, the backend adapters to read or write data on the backend and the
 binders to create the link between them.
 
 """
+import hashlib
+import json
 import logging
 from contextlib import contextmanager
 
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
 
 import odoo
-from odoo import _
+from odoo import _, tools
 
 from odoo.addons.component.core import AbstractComponent
 from odoo.addons.connector.exception import IDMissingInBackend, RetryableJobError
+from odoo.addons.queue_job.job import ENQUEUED, PENDING, STARTED
+
+from ..database import pg_lock_timeout
 
 _logger = logging.getLogger(__name__)
 
@@ -116,11 +122,36 @@ class GenericExporter(AbstractComponent):
     _name = "generic.exporter"
     _inherit = "base.exporter"
     _default_binding_field = None
+    #: name of a field of the binding storing the fingerprint of the last
+    #: exported record (see :meth:`Mapper.fingerprint`). When defined, the
+    #: records whose fingerprint did not change since their last export are
+    #: not exported again.
+    _fingerprint_field = None
+    #: name of a text field of the binding storing the hashes of the values
+    #: of the last exported payload, by key. When defined, the updates only
+    #: send the keys whose value changed since the last export.
+    _payload_hashes_field = None
+    #: number of bindings exported per transaction by :meth:`run_batch`
+    _batch_size = 100
+    #: export the missing dependencies in concurrent jobs rather than
+    #: synchronously, see :meth:`_export_dependencies_concurrently`
+    _concurrent_dependencies = False
+    #: delay in seconds before retrying the export when its dependencies are
+    #: exported in concurrent jobs, see :meth:`_export_dependencies_concurrently`
+    _dependencies_retry_delay = 10
+    #: maximum time in seconds to wait for a binding locked by a concurrent
+    #: job before retrying the export, the lock uses ``NOWAIT`` when empty
+    _lock_timeout = 0.3
 
     def __init__(self, working_context):
         super(GenericExporter, self).__init__(working_context)
         self.binding = None
         self.external_id = None
+        self.fingerprint = None
+        self.payload_hashes = None
+        # when planning the dependencies, see _plan_dependencies
+        self._dependency_graph = None
+        self._dependency_node = None
 
     def _should_import(self):
         return False
@@ -144,6 +175,8 @@ class GenericExporter(AbstractComponent):
         :param binding: binding record to export
         """
         self.binding = binding
+        self.fingerprint = None
+        self.payload_hashes = None
 
         self.external_id = self.binder.to_external(self.binding)
         try:
@@ -157,6 +190,7 @@ class GenericExporter(AbstractComponent):
         result = self._run(*args, **kwargs)
 
         self.binder.bind(self.external_id, self.binding)
+        self._store_export_state()
         # Commit so we keep the external ID when there are several
         # exports (due to dependencies) and one of them fails.
         # The commit will also release the lock acquired on the binding
@@ -167,6 +201,202 @@ class GenericExporter(AbstractComponent):
         self._after_export()
         return result
 
+    def run_batch(self, bindings, fields=None):
+        """Run the synchronization of many bindings
+
+        The bindings are exported by chunks of ``_batch_size``, each chunk
+        being committed. For a chunk:
+
+        * the dependencies of the bindings are exported
+        * the bindings are locked with one statement, see :meth:`_lock_batch`
+        * the records are mapped, the relations being resolved with one
+          call to the binders for the chunk
+        * the records are created or updated with the ``create_many`` and
+          ``write_many`` methods of the backend adapter
+        * the external IDs are bound with one call to the binder
+        * the fingerprints and payload hashes are stored with one statement,
+          see :meth:`_store_export_states`
+
+        The failure of a binding does not prevent the export of the others,
+        the errors are returned. The dependencies exported synchronously are
+        committed as in :meth:`run`, so their external IDs are kept even when
+        the chunk fails. The bindings being exported by concurrent
+        jobs are skipped, a
+        :exc:`~odoo.addons.queue_job.exception.RetryableJobError` is returned
+        for them so the caller can export them later. A database error, or
+        an error which aborted the transaction, still interrupts the export.
+
+        Contrarily to :meth:`run`, the imports of the records are never
+        delayed (see :meth:`_should_import`).
+
+        :param bindings: binding records to export
+        :param fields: fields to export when a record has already been
+                       exported
+        :return: the exception raised for each binding which failed, by ID
+        :rtype: dict
+        """
+        errors = {}
+        for chunk_ids in tools.split_every(self._batch_size, bindings.ids):
+            errors.update(self._run_batch(bindings.browse(chunk_ids), fields=fields))
+            if not odoo.tools.config["test_enable"]:
+                self.env.cr.commit()  # pylint: disable=E8102
+        return errors
+
+    def _run_batch(self, bindings, fields=None):
+        """Export a chunk of bindings, see :meth:`run_batch`"""
+        errors = {}
+        external_ids = self.binder.to_external_many(bindings)
+        # fingerprint and payload hashes of the bindings, by ID
+        states = {}
+
+        to_export = self._prepare_batch(bindings, external_ids, states, errors)
+        locked = self._lock_batch(to_export)
+        for binding in to_export - locked:
+            errors[binding.id] = RetryableJobError(
+                "A concurrent job is already exporting the same record "
+                "(%s with id %s). It must be exported later."
+                % (self.model._name, binding.id),
+                ignore_retry=True,
+            )
+        to_export = locked
+        try:
+            self.mapper.prefetch_records(to_export, for_create=True)
+        except psycopg2.Error:
+            raise
+        except Exception as err:
+            if self._transaction_aborted():
+                raise
+            # the bindings are mapped one by one, the failing ones are
+            # found by _map_batch
+            _logger.info("Cannot prepare the mapping of %s at once: %s", to_export, err)
+        creates, updates, unchanged = self._map_batch(
+            to_export, external_ids, states, errors, fields=fields
+        )
+
+        exported = [(external_ids[binding.id], binding) for binding in unchanged]
+        if creates:
+            results = self.backend_adapter.create_many([data for __, data in creates])
+            self._check_batch_results("create_many", creates, results)
+            for (binding, __), result in zip(creates, results):
+                if isinstance(result, Exception):
+                    self._batch_record_failed(binding, result, errors)
+                else:
+                    exported.append((result, binding))
+        if updates:
+            results = self.backend_adapter.write_many(
+                [(external_ids[binding.id], data) for binding, data in updates]
+            )
+            self._check_batch_results("write_many", updates, results)
+            for (binding, __), result in zip(updates, results):
+                if isinstance(result, Exception):
+                    self._batch_record_failed(binding, result, errors)
+                else:
+                    exported.append((external_ids[binding.id], binding))
+
+        self.binder.bind_many(exported)
+        self._store_export_states(
+            {binding.id: states[binding.id] for __, binding in exported}
+        )
+        for external_id, binding in exported:
+            self._prepare_batch_record(binding, external_id)
+            self._after_export()
+        return errors
+
+    def _check_batch_results(self, method, data, results):
+        """Check that the backend adapter returned a result per record"""
+        if len(results) != len(data):
+            raise ValueError(
+                "%s of the backend adapter returned %d results for %d records"
+                % (method, len(results), len(data))
+            )
+
+    def _prepare_batch(self, bindings, external_ids, states, errors):
+        """Return the bindings to export and export their dependencies"""
+        to_export = self.model.browse()
+        for binding in bindings:
+            self._prepare_batch_record(binding, external_ids[binding.id])
+            try:
+                if self._has_to_skip() or self._is_unchanged():
+                    continue
+                self._export_missing_dependencies()
+            except psycopg2.Error:
+                raise
+            except Exception as err:
+                if self._transaction_aborted():
+                    raise
+                self._batch_record_failed(binding, err, errors)
+                continue
+            to_export |= binding
+            states[binding.id] = (self.fingerprint, self.payload_hashes)
+        return to_export
+
+    def _map_batch(self, bindings, external_ids, states, errors, fields=None):
+        """Map the bindings to export
+
+        Return the lists of ``(binding, data)`` to create and to update,
+        and the list of the bindings having no change to export.
+        """
+        creates = []
+        updates = []
+        unchanged = []
+        for binding in bindings:
+            self._prepare_batch_record(binding, external_ids[binding.id])
+            self.fingerprint = states[binding.id][0]
+            try:
+                map_record = self._map_data()
+                if self.external_id:
+                    data = self._changed_data(
+                        self._update_data(map_record, fields=fields)
+                    )
+                    if not data:
+                        # nothing is sent, the state of the export is kept
+                        states[binding.id] = (None, None)
+                        unchanged.append(binding)
+                        continue
+                    self._validate_update_data(data)
+                    if fields is not None:
+                        # see _run
+                        self.fingerprint = None
+                    updates.append((binding, data))
+                else:
+                    data = self._create_data(map_record)
+                    if not data:
+                        continue
+                    self._validate_create_data(data)
+                    if self._payload_hashes_field:
+                        self.payload_hashes = self._hash_payload(data)
+                    creates.append((binding, data))
+            except psycopg2.Error:
+                raise
+            except Exception as err:
+                if self._transaction_aborted():
+                    raise
+                self._batch_record_failed(binding, err, errors)
+                continue
+            states[binding.id] = (self.fingerprint, self.payload_hashes)
+        return creates, updates, unchanged
+
+    def _transaction_aborted(self):
+        """Indicate if an error aborted the transaction
+
+        The error of a binding cannot be isolated in such case, the
+        export of the chunk has to fail.
+        """
+        status = self.env.cr._cnx.get_transaction_status()
+        return status == TRANSACTION_STATUS_INERROR
+
+    def _batch_record_failed(self, binding, err, errors):
+        """Keep the error of a binding which failed to be exported"""
+        _logger.warning("Export of %s failed: %s", binding, err, exc_info=err)
+        errors[binding.id] = err
+
+    def _prepare_batch_record(self, binding, external_id):
+        """Set the binding being exported in a batch"""
+        self.binding = binding
+        self.external_id = external_id
+        self.fingerprint = None
+        self.payload_hashes = None
+
     def _run(self, fields=None):
         """Flow of the synchronization, implemented in inherited classes"""
         assert self.binding
@@ -177,8 +407,17 @@ class GenericExporter(AbstractComponent):
         if self._has_to_skip():
             return
 
+        if self._is_unchanged():
+            # the fingerprint is already stored
+            self.fingerprint = None
+            return _("Nothing to export.")
+        if fields is not None:
+            # the fingerprint covers all the fields, it can be stored only
+            # when they are all exported
+            self.fingerprint = None
+
         # export the missing linked resources
-        self._export_dependencies()
+        self._export_missing_dependencies()
 
         # prevent other jobs to export the same record
         # will be released on commit (or rollback)
@@ -188,13 +427,18 @@ class GenericExporter(AbstractComponent):
 
         if self.external_id:
             record = self._update_data(map_record, fields=fields)
+            record = self._changed_data(record)
             if not record:
+                self.fingerprint = None
                 return _("Nothing to export.")
             self._update(record)
         else:
             record = self._create_data(map_record, fields=fields)
             if not record:
+                self.fingerprint = None
                 return _("Nothing to export.")
+            if self._payload_hashes_field:
+                self.payload_hashes = self._hash_payload(record)
             self.external_id = self._create(record)
         return _("Record exported with ID %s on Backend.") % self.external_id
 
@@ -216,10 +460,20 @@ class GenericExporter(AbstractComponent):
         with :meth:`_export_dependencies`. Each level will set its own lock
         on the binding record it has to export.
 
+        A concurrent job is waited at most ``_lock_timeout`` seconds before
+        failing, see :func:`~odoo.addons.connector.database.pg_lock_timeout`.
+
         """
-        sql = "SELECT id FROM %s WHERE ID = %%s FOR UPDATE NOWAIT" % self.model._table
+        sql = "SELECT id FROM %s WHERE ID = %%s FOR UPDATE" % self.model._table
+        if not self._lock_timeout:
+            sql += " NOWAIT"
         try:
-            self.env.cr.execute(sql, (self.binding.id,), log_exceptions=False)
+            # the savepoint keeps the transaction usable when the record
+            # cannot be locked, see run_batch
+            with self.env.cr.savepoint(), pg_lock_timeout(
+                self.env.cr, self._lock_timeout, name=self.model._name
+            ):
+                self.env.cr.execute(sql, (self.binding.id,), log_exceptions=False)
         except psycopg2.OperationalError:
             _logger.info(
                 "A concurrent job is already exporting the same "
@@ -233,10 +487,162 @@ class GenericExporter(AbstractComponent):
                 % (self.model._name, self.binding.id)
             )
 
+    def _lock_batch(self, bindings):
+        """Lock many binding records, see :meth:`_lock`
+
+        The bindings are locked with one statement. The bindings already
+        locked by concurrent transactions are skipped, see
+        :meth:`~odoo.addons.connector.components.locker.RecordLocker.lock_available`.
+
+        :return: the bindings which have been locked
+        """
+        return self.component(usage="record.locker").lock_available(bindings)
+
     def _has_to_skip(self):
         """Return True if the export can be skipped"""
         return False
 
+    def _is_unchanged(self):
+        """Return True if the record did not change since its last export
+
+        Only when a ``_fingerprint_field`` is defined. The fingerprint is
+        kept in ``self.fingerprint`` to be stored after the export. It is
+        stored only after an export of all the fields which sent data, so
+        a partial export does not prevent the next exports of the other
+        fields.
+        """
+        if not self._fingerprint_field:
+            return False
+        self.fingerprint = self.mapper.fingerprint(self.binding)
+        return bool(
+            self.external_id
+            and self.binding[self._fingerprint_field] == self.fingerprint
+        )
+
+    def _hash_payload(self, data):
+        """Return a hash of the value of each key of the data to export"""
+        return {
+            key: hashlib.sha1(
+                json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            for key, value in data.items()
+        }
+
+    def _changed_data(self, data):
+        """Keep only the keys whose value changed since the last export
+
+        Only when a ``_payload_hashes_field`` is defined. The hashes of the
+        payload, updated with the new values, are kept in
+        ``self.payload_hashes`` to be stored after the export.
+        """
+        if not self._payload_hashes_field:
+            return data
+        exported_hashes = json.loads(self.binding[self._payload_hashes_field] or "{}")
+        hashes = self._hash_payload(data)
+        changed = {
+            key: value
+            for key, value in data.items()
+            if exported_hashes.get(key) != hashes[key]
+        }
+        exported_hashes.update(hashes)
+        self.payload_hashes = exported_hashes
+        return changed
+
+    def _store_export_state(self):
+        """Store on the binding the state used by the next exports
+
+        See ``_fingerprint_field`` and ``_payload_hashes_field``.
+        """
+        values = {}
+        if self.fingerprint is not None:
+            values[self._fingerprint_field] = self.fingerprint
+        if self.payload_hashes is not None:
+            values[self._payload_hashes_field] = json.dumps(
+                self.payload_hashes, sort_keys=True
+            )
+        if values:
+            self.binding.with_context(connector_no_export=True).write(values)
+
+    def _store_export_states(self, states):
+        """Store the state of many exported bindings, see :meth:`run_batch`
+
+        Like :meth:`_store_export_state`, but the bindings are updated with
+        one SQL statement per chunk of bindings storing the same fields,
+        instead of one ``write`` per binding.
+
+        :param states: ``(fingerprint, payload_hashes)`` by binding ID
+        :type states: dict
+        """
+        fnames = [
+            fname
+            for fname in (self._fingerprint_field, self._payload_hashes_field)
+            if fname
+        ]
+        if not fnames:
+            return
+        if not all(
+            self.model._fields[fname].store
+            and self.model._fields[fname].column_type
+            and not self.model._fields[fname].inherited
+            for fname in fnames
+        ):
+            # not columns of the binding table, use the ORM
+            for binding_id, (fingerprint, payload_hashes) in states.items():
+                self.binding = self.model.browse(binding_id)
+                self.fingerprint = fingerprint
+                self.payload_hashes = payload_hashes
+                self._store_export_state()
+            return
+
+        # the bindings are grouped by the fields to store
+        groups = {}
+        for binding_id, (fingerprint, payload_hashes) in states.items():
+            values = {}
+            if fingerprint is not None:
+                values[self._fingerprint_field] = fingerprint
+            if payload_hashes is not None:
+                values[self._payload_hashes_field] = json.dumps(
+                    payload_hashes, sort_keys=True
+                )
+            if values:
+                groups.setdefault(tuple(values), {})[binding_id] = values
+        if not groups:
+            return
+
+        bindings = self.model.browse(
+            [binding_id for group in groups.values() for binding_id in group]
+        )
+        self.model.flush(fnames, bindings)
+        # the write date was just updated by the binder, see bind_many
+        query = """
+            UPDATE "{table}"
+            SET {assignments}
+            FROM (VALUES {values}) AS v(id, {columns})
+            WHERE "{table}".id = v.id
+        """
+        for group_fnames, group in groups.items():
+            columns = ", ".join('"%s"' % fname for fname in group_fnames)
+            assignments = ", ".join(
+                '"{0}" = v."{0}"'.format(fname) for fname in group_fnames
+            )
+            row = "(%s)" % ", ".join(["%s"] * (len(group_fnames) + 1))
+            for chunk in tools.split_every(self.env.cr.IN_MAX, list(group)):
+                params = []
+                for binding_id in chunk:
+                    params.append(binding_id)
+                    params += [group[binding_id][fname] for fname in group_fnames]
+                self.env.cr.execute(
+                    query.format(
+                        table=self.model._table,
+                        assignments=assignments,
+                        columns=columns,
+                        values=", ".join([row] * len(chunk)),
+                    ),
+                    params,
+                )
+        bindings.invalidate_cache(fnames, bindings.ids)
+        bindings.with_context(connector_no_export=True).modified(fnames)
+
     @contextmanager
     def _retry_unique_violation(self):
         """Context manager: catch Unique constraint error and retry the
@@ -296,7 +702,7 @@ class GenericExporter(AbstractComponent):
                      of the exporter synchronization,
                      in :meth:`~._export_dependencies`.
 
-        :param relation: record to export if not already exported
+        :param relation: records to export if not already exported
         :type relation: :py:class:`odoo.models.BaseModel`
         :param binding_model: name of the binding model for the relation
         :type binding_model: str | unicode
@@ -324,59 +730,193 @@ class GenericExporter(AbstractComponent):
         wrap = relation._name != binding_model
 
         if wrap and hasattr(relation, binding_field):
-            domain = [
-                ("odoo_id", "=", relation.id),
-                ("backend_id", "=", self.backend_record.id),
-            ]
-            binding = self.env[binding_model].search(domain)
-            if binding:
-                assert len(binding) == 1, (
-                    "only 1 binding for a backend is " "supported in _export_dependency"
-                )
-            # we are working with a unwrapped record (e.g.
-            # product.category) and the binding does not exist yet.
+            # we are working with unwrapped records (e.g.
+            # product.category) and the bindings may not exist yet.
             # Example: I created a product.product and its binding
             # my_backend.product.product and we are exporting it, but we need
             # to create the binding for the product.category on which it
             # depends.
-            else:
-                bind_values = {
-                    "backend_id": self.backend_record.id,
-                    "odoo_id": relation.id,
-                }
-                if binding_extra_vals:
-                    bind_values.update(binding_extra_vals)
-                # If 2 jobs create it at the same time, retry
-                # one later. A unique constraint (backend_id,
-                # odoo_id) should exist on the binding model
-                with self._retry_unique_violation():
-                    binding = (
-                        self.env[binding_model]
-                        .with_context(connector_no_export=True)
-                        .sudo()
-                        .create(bind_values)
-                    )
-                    # Eager commit to avoid having 2 jobs
-                    # exporting at the same time. The constraint
-                    # will pop if an other job already created
-                    # the same binding. It will be caught and
-                    # raise a RetryableJobError.
-                    if not odoo.tools.config["test_enable"]:
-                        self.env.cr.commit()  # pylint: disable=E8102
+            bindings = self._get_or_create_bindings(
+                relation, binding_model, binding_extra_vals=binding_extra_vals
+            )
         else:
             # If my_backend_bind_ids does not exist we are typically in a
             # "direct" binding (the binding record is the same record).
             # If wrap is True, relation is already a binding record.
-            binding = relation
-
-        if not rel_binder.to_external(binding):
+            bindings = relation
+
+        external_ids = rel_binder.to_external_many(bindings)
+        for binding in bindings:
+            if external_ids[binding.id]:
+                continue
+            if self._dependency_graph is not None:
+                self._plan_dependency(binding, component_usage)
+                continue
             exporter = self.component(usage=component_usage, model_name=binding_model)
             exporter.run(binding)
 
+    def _get_or_create_bindings(self, relation, binding_model, binding_extra_vals=None):
+        """Return the bindings of records, create the missing ones
+
+        The bindings are searched and created with one query each, see
+        ``_get_or_create_bindings`` on the ``external.binding`` model. When
+        a concurrent job is creating the same bindings, it is waited at most
+        ``_lock_timeout`` seconds. If it is still running or if the bindings
+        it created cannot be read by the current transaction, the job is
+        retried later.
+        """
+        model = self.env[binding_model].with_context(connector_no_export=True).sudo()
+        try:
+            # the savepoint keeps the transaction usable when the bindings
+            # cannot be created, see run_batch
+            with self.env.cr.savepoint(), pg_lock_timeout(
+                self.env.cr, self._lock_timeout, name=binding_model
+            ):
+                with self._retry_unique_violation():
+                    bindings = model._get_or_create_bindings(
+                        self.backend_record, relation, values=binding_extra_vals
+                    )
+        except psycopg2.OperationalError as err:
+            raise RetryableJobError(
+                "A database error caused the failure of the job:\n"
+                "%s\n\n"
+                "Likely due to 2 concurrent jobs wanting to create "
+                "the same bindings. The job will be retried later." % err,
+                ignore_retry=True,
+            )
+        if len(bindings) < len(set(relation.ids)):
+            raise RetryableJobError(
+                "Bindings of %s are being created by a concurrent job. "
+                "The job will be retried later." % (relation - bindings.odoo_id,),
+                ignore_retry=True,
+            )
+        return bindings.with_env(self.env)
+
     def _export_dependencies(self):
         """Export the dependencies for the record"""
         return
 
+    def _export_missing_dependencies(self):
+        if self._concurrent_dependencies:
+            self._export_dependencies_concurrently()
+        else:
+            self._export_dependencies()
+
+    def _plan_dependencies(self):
+        """Return the graph of the dependencies to export
+
+        Walk through :meth:`_export_dependencies` and the ones of the
+        dependencies, without exporting them, to find all the bindings
+        which have no external ID yet.
+
+        :rtype: :class:`DependencyGraph`
+        """
+        graph = DependencyGraph()
+        self._dependency_graph = graph
+        try:
+            self._export_dependencies()
+        finally:
+            self._dependency_graph = None
+        return graph
+
+    def _plan_dependency(self, binding, component_usage):
+        """Add a dependency and its own dependencies to the graph"""
+        graph = self._dependency_graph
+        node = (binding._name, binding.id)
+        known = node in graph
+        graph.add(self._dependency_node, node, component_usage)
+        if known:
+            return
+        exporter = self.component(usage=component_usage, model_name=binding._name)
+        exporter.binding = binding
+        exporter._dependency_graph = graph
+        exporter._dependency_node = node
+        try:
+            exporter._export_dependencies()
+        finally:
+            exporter._dependency_graph = None
+
+    def _export_dependencies_concurrently(self):
+        """Export the dependencies in concurrent jobs
+
+        The graph of the missing dependencies is built (see
+        :meth:`_plan_dependencies`), and a job is delayed for each of the
+        dependencies which do not depend on other missing ones, so they are
+        exported concurrently. The current job is then retried later, and
+        exports the next level of the graph, until all the dependencies are
+        exported.
+
+        The delayed jobs and the bindings created while planning are
+        committed before the current job is retried, after
+        ``_dependencies_retry_delay`` seconds. A retry counts in the
+        ``max_retries`` of the job only when no new job has been delayed,
+        the dependencies being still exported by the jobs of the previous
+        attempts, so a dependency which cannot be exported does not retry
+        the job forever.
+        """
+        graph = self._plan_dependencies()
+        if not graph:
+            return
+        leaves = graph.leaves()
+        if not leaves:
+            # the dependencies are cyclic, export them synchronously
+            self._export_dependencies()
+            return
+        delayed = 0
+        for model_name, binding_id in leaves:
+            if self._delay_export_dependency(
+                self.env[model_name].browse(binding_id),
+                graph.usages[(model_name, binding_id)],
+            ):
+                delayed += 1
+        # the job is rollbacked on RetryableJobError, keep the delayed jobs
+        if not odoo.tools.config["test_enable"]:
+            self.env.cr.commit()  # pylint: disable=E8102
+        raise RetryableJobError(
+            "%d dependencies have to be exported before %s, %d are being "
+            "exported (%d new jobs). The job will be retried later."
+            % (len(graph), self.binding, len(leaves), delayed),
+            seconds=self._dependencies_retry_delay,
+            # the export progressed to the next level of the dependencies
+            ignore_retry=bool(delayed),
+        )
+
+    def _delay_export_dependency(self, binding, component_usage):
+        """Delay a job to export a dependency
+
+        The job runs ``export_dependency`` on the binding (see
+        ``external.binding``). It is not delayed when a job is already
+        exporting the dependency. Can be overridden to delay the export
+        jobs of the connector instead, returning whether a new job has been
+        delayed.
+
+        :param binding: binding record to export
+        :param component_usage: usage of the exporter of the binding
+        :return: True when a new job has been delayed
+        :rtype: bool
+        """
+        identity_key = "export_dependency:%s,%s,%s" % (
+            binding._name,
+            binding.id,
+            component_usage,
+        )
+        running = (
+            self.env["queue.job"]
+            .sudo()
+            .search_count(
+                [
+                    ("identity_key", "=", identity_key),
+                    ("state", "in", (PENDING, ENQUEUED, STARTED)),
+                ]
+            )
+        )
+        if running:
+            return False
+        binding.with_delay(identity_key=identity_key).export_dependency(
+            component_usage=component_usage
+        )
+        return True
+
     def _map_data(self):
         """Returns an instance of
         :py:class:`~odoo.addons.connector.components.mapper.MapRecord`
@@ -426,6 +966,38 @@ class GenericExporter(AbstractComponent):
         self.backend_adapter.write(self.external_id, data)
 
 
+class DependencyGraph:
+    """Bindings to export before a record, and their own dependencies
+
+    The nodes are ``(model_name, binding_id)``, the dependencies of the
+    record itself having no parent (None). Built by
+    :meth:`GenericExporter._plan_dependencies`.
+    """
+
+    def __init__(self):
+        # missing dependencies of each node
+        self.dependencies = {}
+        # usage of the exporter of each node
+        self.usages = {}
+
+    def __len__(self):
+        return len(self.usages)
+
+    def __contains__(self, node):
+        return node in self.usages
+
+    def add(self, parent, node, component_usage):
+        """Add a dependency of ``parent``"""
+        self.usages.setdefault(node, component_usage)
+        self.dependencies.setdefault(node, set())
+        if parent is not None:
+            self.dependencies[parent].add(node)
+
+    def leaves(self):
+        """Return the nodes which do not depend on other missing nodes"""
+        return [node for node in self.usages if not self.dependencies[node]]
+
+
 class Importer(AbstractComponent):
     """Synchronizer for importing data from a backend to Odoo"""
 
@@ -436,6 +1008,220 @@ class Importer(AbstractComponent):
     _base_mapper_usage = "import.mapper"
 
 
+class GenericImporter(AbstractComponent):
+    """Generic Synchronizer for importing data from a backend to Odoo
+
+    Import the records by pages:
+
+    * the records of a page are read with the ``search_read`` method of the
+      backend adapter, see :meth:`_read_page`
+    * the existing bindings of the page are found with one query
+    * the records are mapped with the import mapper, the relations being
+      resolved with one call to the binders for the page
+    * the new bindings are created with one call to ``create``
+    * the existing bindings are updated with one ``write`` per set of
+      identical values
+    * the external IDs are bound with one call to the binder
+
+    """
+
+    _name = "generic.importer"
+    _inherit = "base.importer"
+
+    #: number of records read per page
+    _page_size = 100
+    #: key of the external ID in the records read from the backend
+    _external_id_key = "id"
+
+    def run(self, filters=None):
+        """Run the synchronization
+
+        Each page is committed. The failure of a record does not prevent
+        the import of the others, the errors are returned.
+
+        :param filters: filters given to the backend adapter
+        :return: the exception raised for each record which failed,
+                 by external ID
+        :rtype: dict
+        """
+        errors = {}
+        offset = 0
+        while True:
+            records = self._read_page(filters, offset, self._page_size)
+            if not records:
+                break
+            errors.update(self._import_page(records))
+            if not odoo.tools.config["test_enable"]:
+                self.env.cr.commit()  # pylint: disable=E8102
+            if len(records) < self._page_size:
+                break
+            offset += len(records)
+        return errors
+
+    def _read_page(self, filters, offset, limit):
+        """Return a page of records from the backend
+
+        Adapt in the sub-classes to the signature of the ``search_read`` of
+        the backend adapter.
+        """
+        return self.backend_adapter.search_read(filters, offset=offset, limit=limit)
+
+    def _get_external_id(self, record):
+        """Return the external ID of a record read from the backend"""
+        return record[self._external_id_key]
+
+    def _must_skip(self, record, binding):
+        """Return True if the import of a record can be skipped
+
+        :param record: record read from the backend
+        :param binding: existing binding, empty if it does not exist yet
+        """
+        return False
+
+    def _validate_data(self, data):
+        """Check if the values to import are correct
+
+        Pro-actively check before the ``create`` or ``write`` if some fields
+        are missing or invalid
+
+        Raise `InvalidDataError`
+        """
+        return
+
+    def _create_data(self, map_record, **kwargs):
+        """Get the data to pass to :meth:`_create_many`"""
+        data = map_record.values(for_create=True, **kwargs)
+        data.setdefault(self.binder._backend_field, self.backend_record.id)
+        return data
+
+    def _update_data(self, map_record, **kwargs):
+        """Get the data to pass to :meth:`_update_many`"""
+        return map_record.values(**kwargs)
+
+    def _import_page(self, records):
+        """Import a page of records, see :meth:`run`"""
+        errors = {}
+        external_ids = [self._get_external_id(record) for record in records]
+        bindings = self.binder.to_internal_many(external_ids)
+        self.mapper.prefetch_records(records, for_create=True)
+
+        creates = []
+        updates = []
+        for external_id, record in zip(external_ids, records):
+            binding = bindings[external_id]
+            try:
+                if self._must_skip(record, binding):
+                    continue
+                map_record = self.mapper.map_record(record)
+                if binding:
+                    data = self._update_data(map_record)
+                    self._validate_data(data)
+                    updates.append((external_id, binding, data))
+                else:
+                    data = self._create_data(map_record)
+                    self._validate_data(data)
+                    creates.append((external_id, data))
+            except psycopg2.Error:
+                raise
+            except Exception as err:
+                self._page_record_failed(external_id, err, errors)
+
+        imported = self._create_many(creates, errors)
+        imported += self._update_many(updates, errors)
+        self.binder.bind_many(imported)
+        return errors
+
+    def _create_many(self, creates, errors):
+        """Create the bindings, with one ``create`` when possible
+
+        When the creation fails, the bindings are created one by one so
+        only the failing records are not imported. The concurrency errors
+        (``OperationalError``, e.g. serialization failures or deadlocks) are
+        not caught, so the job is retried. The other database errors, such
+        as the violation of a SQL constraint, are kept as errors of their
+        records, each record being created in a savepoint.
+
+        :param creates: list of ``(external_id, data)``
+        :param errors: exceptions of the records which failed, by external ID
+        :return: list of ``(external_id, binding)`` of the created bindings
+        """
+        if not creates:
+            return []
+        model = self.model.with_context(connector_no_export=True)
+        try:
+            with self.env.cr.savepoint():
+                bindings = model.create([data for __, data in creates])
+            return list(zip([external_id for external_id, __ in creates], bindings))
+        except psycopg2.OperationalError:
+            raise
+        except Exception as err:
+            if len(creates) == 1:
+                self._page_record_failed(creates[0][0], err, errors)
+                return []
+        created = []
+        for external_id, data in creates:
+            try:
+                with self.env.cr.savepoint():
+                    created.append((external_id, model.create(data)))
+            except psycopg2.OperationalError:
+                raise
+            except Exception as err:
+                self._page_record_failed(external_id, err, errors)
+        return created
+
+    def _update_many(self, updates, errors):
+        """Update the bindings, with one ``write`` per set of identical values
+
+        When a ``write`` fails, its bindings are written one by one so only
+        the failing records are not imported. The concurrency errors are not
+        caught, so the job is retried, the other database errors are kept as
+        errors of their records, see :meth:`_create_many`.
+
+        :param updates: list of ``(external_id, binding, data)``
+        :param errors: exceptions of the records which failed, by external ID
+        :return: list of ``(external_id, binding)`` of the updated bindings
+        """
+        groups = {}
+        for external_id, binding, data in updates:
+            key = repr(sorted(data.items()))
+            groups.setdefault(key, (data, []))[1].append((external_id, binding))
+        updated = []
+        for data, group in groups.values():
+            bindings = self.model.browse([binding.id for __, binding in group])
+            try:
+                with self.env.cr.savepoint():
+                    bindings.with_context(connector_no_export=True).write(data)
+                updated += group
+                continue
+            except psycopg2.OperationalError:
+                raise
+            except Exception as err:
+                if len(group) == 1:
+                    self._page_record_failed(group[0][0], err, errors)
+                    continue
+            for external_id, binding in group:
+                try:
+                    with self.env.cr.savepoint():
+                        binding.with_context(connector_no_export=True).write(data)
+                    updated.append((external_id, binding))
+                except psycopg2.OperationalError:
+                    raise
+                except Exception as err:
+                    self._page_record_failed(external_id, err, errors)
+        return updated
+
+    def _page_record_failed(self, external_id, err, errors):
+        """Keep the error of a record which failed to be imported"""
+        _logger.warning(
+            "Import of %s with external ID %s failed: %s",
+            self.model._name,
+            external_id,
+            err,
+            exc_info=err,
+        )
+        errors[external_id] = err
+
+
 class Deleter(AbstractComponent):
     """Synchronizer for deleting a record on the backend"""
 
@@ -4,11 +4,28 @@
 import hashlib
 import logging
 import struct
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
 
 _logger = logging.getLogger(__name__)
 
+try:
+    from cachetools import LRUCache
+except ImportError:
+    _logger.debug("Cannot import 'cachetools'.")
+
+#: namespace of the advisory locks acquired without namespace
+DEFAULT_LOCK_NAMESPACE = "connector"
+# Number of lock names kept in the registry of the process to give
+# a name to the keys of the locks, see LockRegistry
+LOCK_REGISTRY_SIZE = 4096
+
 
-def pg_try_advisory_lock(env, lock):
+def pg_try_advisory_lock(env, lock, namespace=None):
     """Try to acquire a Postgres transactional advisory lock.
 
     The function tries to acquire a lock, returns a boolean indicating
@@ -60,19 +77,305 @@ def pg_try_advisory_lock(env, lock):
                                     seconds=2,
                                     ignore_retry=True)
 
+    The key of the lock is composed of 2 integers: the hash of the
+    namespace and the hash of the lock name, see :func:`advisory_lock_key`,
+    so the locks of a namespace can be found in ``pg_locks``, see
+    :func:`pg_connector_locks`.
+
     :param env: the Odoo Environment
     :param lock: The lock name. Can be anything convertible to a
        string.  It needs to represents what should not be synchronized
        concurrently so usually the string will contain at least: the
        action, the backend type, the backend id, the model name, the
        external id
+    :param namespace: namespace of the lock, usually built with
+       :func:`lock_namespace`, ``DEFAULT_LOCK_NAMESPACE`` when empty
     :return True/False whether lock was acquired.
     """
-    hasher = hashlib.sha1(str(lock).encode())
-    # pg_lock accepts an int8 so we build an hash composed with
-    # contextual information and we throw away some bits
-    int_lock = struct.unpack("q", hasher.digest()[:8])
-
-    env.cr.execute("SELECT pg_try_advisory_xact_lock(%s);", (int_lock,))
+    key = advisory_lock_key(lock, namespace=namespace)
+    env.cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s);", key)
     acquired = env.cr.fetchone()[0]
+    lock_wait_metrics.add(lock_registry.namespace(key[0]), 0.0, acquired=acquired)
+    return acquired
+
+
+def pg_try_advisory_locks(env, locks, namespace=None):
+    """Try to acquire many Postgres transactional advisory locks at once
+
+    Like :func:`pg_try_advisory_lock`, but all the locks are tried with
+    a single statement. Either all the locks are acquired, or none: when
+    one of them is held by another transaction, the locks acquired by the
+    statement are released right away.
+
+    The locks are tried in the order of their keys, so 2 transactions
+    trying the same locks do not interlock each other.
+
+    :param env: the Odoo Environment
+    :param locks: iterable of lock names, see :func:`pg_try_advisory_lock`
+    :param namespace: namespace of the locks, see :func:`pg_try_advisory_lock`
+    :return True/False whether all the locks were acquired.
+    """
+    keys = sorted({advisory_lock_key(lock, namespace=namespace) for lock in locks})
+    if not keys:
+        return True
+    acquired = True
+    try:
+        # the locks acquired in a savepoint are released when rollbacked
+        # to it, transactional advisory locks cannot be unlocked otherwise
+        with env.cr.savepoint(flush=False):
+            # bool_and evaluates every row, so all the locks are tried
+            env.cr.execute(
+                "SELECT bool_and(pg_try_advisory_xact_lock(ns, obj)) "
+                "FROM unnest(%s::int[], %s::int[]) AS key(ns, obj);",
+                ([key[0] for key in keys], [key[1] for key in keys]),
+            )
+            if not env.cr.fetchone()[0]:
+                raise _LocksNotAcquired()
+    except _LocksNotAcquired:
+        acquired = False
+    lock_wait_metrics.add(lock_registry.namespace(keys[0][0]), 0.0, acquired=acquired)
     return acquired
+
+
+class _LocksNotAcquired(Exception):
+    """Rollback the savepoint of :func:`pg_try_advisory_locks`"""
+
+
+def lock_namespace(backend, model_name):
+    """Return the namespace of the advisory locks of a model for a backend
+
+    Example: ``magento.backend(1):product.product``
+    """
+    return "{}({}):{}".format(backend._name, backend.id, model_name)
+
+
+def advisory_lock_key(lock, namespace=None):
+    """Return the key of an advisory lock
+
+    The key is composed of 2 int4: the hash of the namespace and the hash of
+    the lock name, as expected by the 2 arguments variants of the
+    ``pg_*advisory*`` functions. They are the ``classid`` and ``objid``
+    columns of ``pg_locks``, with an ``objsubid`` of 2.
+
+    With 32 bits, different lock names of a namespace may have the same
+    key: a lock would then be refused because of another one, and the job
+    retried later.
+
+    The name of the key is kept in :data:`lock_registry`.
+
+    :param lock: the lock name, see :func:`pg_try_advisory_lock`
+    :param namespace: namespace of the lock, ``DEFAULT_LOCK_NAMESPACE`` when
+                      empty
+    :return: tuple ``(namespace key, lock key)``
+    """
+    namespace = str(namespace or DEFAULT_LOCK_NAMESPACE)
+    lock = str(lock)
+    key = (_int4_hash(namespace), _int4_hash(lock))
+    lock_registry.register(key, namespace, lock)
+    return key
+
+
+def _int4_hash(value):
+    # pg_lock accepts 2 int4 so we build an hash composed with
+    # contextual information and we throw away some bits
+    return struct.unpack("i", hashlib.sha1(value.encode()).digest()[:4])[0]
+
+
+class LockRegistry:
+    """Names of the advisory locks by key
+
+    The keys of the advisory locks are hashes, the registry keeps the names
+    of the namespaces and locks whose keys have been computed by the
+    current process, so the locks found in ``pg_locks`` can be named. The
+    lock names are kept in a LRU cache, the locks acquired by other
+    processes may not be named.
+    """
+
+    def __init__(self, maxsize=LOCK_REGISTRY_SIZE):
+        self._lock = threading.Lock()
+        self._namespaces = {}
+        self._names = LRUCache(maxsize=maxsize)
+
+    def register(self, key, namespace, name):
+        """Keep the namespace and name of a lock key"""
+        with self._lock:
+            self._namespaces[key[0]] = namespace
+            self._names[key] = name
+
+    def namespace(self, namespace_key):
+        """Return the name of a namespace key, None if unknown"""
+        return self._namespaces.get(namespace_key)
+
+    def name(self, key):
+        """Return the name of a lock key, None if unknown"""
+        with self._lock:
+            return self._names.get(key)
+
+
+lock_registry = LockRegistry()
+
+
+def pg_connector_locks(env, namespace=None):
+    """Return the holders and waiters of the connector advisory locks
+
+    The advisory locks having a 2 int4 key (see :func:`advisory_lock_key`)
+    are read from ``pg_locks`` for the current database, along with the
+    activity of the transactions holding or waiting for them, to find the
+    locks which are contended when the throughput of the jobs collapses.
+
+    ``pg_try_advisory_xact_lock`` never waits, so the waiters are only the
+    transactions using the blocking ``pg_advisory_xact_lock``.
+
+    Usage example:
+
+    ::
+
+        from collections import Counter
+
+        locks = pg_connector_locks(env, lock_namespace(backend, 'res.partner'))
+        hot = Counter(lock['name'] for lock in locks).most_common(10)
+
+    :param env: the Odoo Environment
+    :param namespace: when given, only the locks of this namespace are
+                      returned
+    :return: list of dicts with the keys: ``key``, ``namespace`` and
+             ``name`` (None when not found in :data:`lock_registry`),
+             ``pid``, ``granted`` (False for the waiters), ``mode``,
+             ``state``, ``xact_start`` and ``query_start`` of the backend
+             holding or waiting for the lock
+    """
+    query = """
+        SELECT l.classid::int, l.objid::int, l.pid, l.granted, l.mode,
+               a.state, a.xact_start, a.query_start
+        FROM pg_locks l
+        LEFT JOIN pg_stat_activity a ON a.pid = l.pid
+        WHERE l.locktype = 'advisory'
+        AND l.objsubid = 2
+        AND l.database = (
+            SELECT oid FROM pg_database WHERE datname = current_database()
+        )
+    """
+    params = []
+    if namespace:
+        query += " AND l.classid::int = %s"
+        params.append(_int4_hash(str(namespace)))
+    query += " ORDER BY l.classid, l.objid, l.granted DESC, a.xact_start"
+    env.cr.execute(query, params)
+    locks = []
+    for row in env.cr.fetchall():
+        key = (row[0], row[1])
+        locks.append(
+            {
+                "key": key,
+                "namespace": lock_registry.namespace(key[0]),
+                "name": lock_registry.name(key),
+                "pid": row[2],
+                "granted": row[3],
+                "mode": row[4],
+                "state": row[5],
+                "xact_start": row[6],
+                "query_start": row[7],
+            }
+        )
+    return locks
+
+
+class LockWaitMetrics:
+    """Time spent waiting for locks in the current process
+
+    The metrics are kept by lock name, usually the model of the locked
+    records or the namespace of the advisory locks. For each name, it keeps
+    the number of attempts to lock, the number of attempts which failed
+    (timeout or ``NOWAIT``), the total and the maximum time waited, in
+    seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def add(self, name, wait, acquired=True):
+        """Record an attempt to lock"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = {
+                    "count": 0,
+                    "failed": 0,
+                    "wait": 0.0,
+                    "max_wait": 0.0,
+                }
+            metric["count"] += 1
+            if not acquired:
+                metric["failed"] += 1
+            metric["wait"] += wait
+            metric["max_wait"] = max(metric["max_wait"], wait)
+
+    def get(self):
+        """Return a copy of the metrics, by lock name"""
+        with self._lock:
+            return {name: dict(metric) for name, metric in self._metrics.items()}
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+
+lock_wait_metrics = LockWaitMetrics()
+
+
+@contextmanager
+def pg_lock_timeout(cr, timeout, name=None):
+    """Bound the time waited for the locks taken in the context
+
+    The ``lock_timeout`` of the transaction is set to ``timeout`` seconds
+    for the statements executed in the context, then restored. A statement
+    which cannot acquire its locks in time fails with a
+    :exc:`psycopg2.OperationalError`, as with ``NOWAIT``, and the
+    transaction is aborted.
+
+    Waiting a few hundred milliseconds for a lock held by a short
+    transaction is far cheaper than failing right away and having the job
+    retried with a new transaction.
+
+    The time waited is recorded in :data:`lock_wait_metrics`.
+
+    Usage example:
+
+    ::
+
+        sql = "SELECT id FROM res_partner WHERE id IN %s FOR UPDATE"
+        try:
+            with pg_lock_timeout(env.cr, 0.3, name="res.partner"):
+                env.cr.execute(sql, (tuple(ids),), log_exceptions=False)
+        except psycopg2.OperationalError:
+            raise RetryableJobError("Could not lock the partners")
+
+    :param cr: the database cursor
+    :param timeout: maximum time to wait in seconds, when empty the
+                    ``lock_timeout`` is left unchanged, so the statements
+                    should use ``NOWAIT``
+    :param name: name under which the time waited is recorded
+    """
+    if timeout:
+        cr.execute("SHOW lock_timeout")
+        previous = cr.fetchone()[0]
+        cr.execute(
+            "SELECT set_config('lock_timeout', %s, true)",
+            ("%dms" % max(1, int(timeout * 1000)),),
+        )
+    start = time.perf_counter()
+    try:
+        yield
+    except psycopg2.OperationalError:
+        wait = time.perf_counter() - start
+        lock_wait_metrics.add(name, wait, acquired=False)
+        _logger.debug("Could not acquire locks on %s in %.3fs", name, wait)
+        raise
+    finally:
+        # nothing to restore when the transaction is aborted
+        if timeout and (cr._cnx.get_transaction_status() != TRANSACTION_STATUS_INERROR):
+            cr.execute("SELECT set_config('lock_timeout', %s, true)", (previous,))
+    wait = time.perf_counter() - start
+    lock_wait_metrics.add(name, wait)
+    _logger.debug("Acquired locks on %s in %.3fs", name, wait)
@@ -2,7 +2,9 @@
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html)
 
 
-from odoo import fields, models
+from odoo import api, fields, models, tools
+
+from ..components.binder import drop_identity_map, forget_bindings
 
 
 class ConnectorBackend(models.AbstractModel):
@@ -116,6 +118,199 @@ class ExternalBinding(models.AbstractModel):
     _name = "external.binding"
     _description = "External Binding (abstract)"
 
+    # fields used by the binders to find the bindings, override when the
+    # binders use other fields (see Binder._identity_map)
+    _binder_fields = ("backend_id", "external_id", "odoo_id")
+
     sync_date = fields.Datetime(string="Last synchronization date")
     # add other fields in concrete models
     # XXX we could add a default 'external_id'
+
+    def write(self, vals):
+        if any(fname in vals for fname in self._binder_fields):
+            # the binders must not find the bindings with their old values
+            forget_bindings(self.env.cr, self._name, self.ids)
+        return super().write(vals)
+
+    def unlink(self):
+        # the binders must not find the deleted bindings anymore
+        drop_identity_map(self.env.cr)
+        return super().unlink()
+
+    def export_dependency(self, component_usage="record.exporter"):
+        """Export the binding, job delayed by the exports depending on it
+
+        See ``_concurrent_dependencies`` on the generic exporter.
+        """
+        self.ensure_one()
+        with self.backend_id.work_on(self._name) as work:
+            exporter = work.component(usage=component_usage)
+            return exporter.run(self)
+
+    @api.model
+    def _get_or_create_bindings(self, backend, records, values=None):
+        """Return the bindings of records for a backend, create the missing
+
+        The existing bindings are searched with one query, the missing ones
+        are inserted with ``INSERT ... ON CONFLICT (backend_id, odoo_id) DO
+        NOTHING`` (see :meth:`_insert_bindings`), so when concurrent
+        transactions create the same bindings, the insertion waits for the
+        other transaction to end instead of failing with an
+        ``IntegrityError``. It needs a unique constraint on ``(backend_id,
+        odoo_id)``, without it the bindings are created with ``create``.
+
+        Under the ``REPEATABLE READ`` isolation level used by Odoo, a
+        binding created by a transaction committed after the start of the
+        current one cannot be read: the insertion then fails with a
+        serialization error, and the bindings not found are missing from
+        the result.
+
+        :param backend: backend record of the bindings
+        :param records: normal records (e.g. ``product.product``) to bind
+        :param values: values of the bindings to create, in addition to
+                       ``backend_id`` and ``odoo_id``
+        :return: the bindings, in the order of ``records``
+        """
+        record_ids = list(dict.fromkeys(records.ids))
+        if not record_ids:
+            return self.browse()
+        binding_ids = self._search_binding_ids(backend, record_ids)
+        missing_ids = [rid for rid in record_ids if rid not in binding_ids]
+        if missing_ids:
+            binding_ids.update(self._insert_bindings(backend, missing_ids, values))
+            missing_ids = [rid for rid in missing_ids if rid not in binding_ids]
+        if missing_ids:
+            # conflicts with bindings created concurrently
+            binding_ids.update(self._search_binding_ids(backend, missing_ids))
+        return self.browse(
+            [binding_ids[rid] for rid in record_ids if rid in binding_ids]
+        )
+
+    @api.model
+    def _search_binding_ids(self, backend, record_ids):
+        """Return the IDs of the bindings of a backend, by record ID"""
+        bindings = self.with_context(active_test=False).search(
+            [("backend_id", "=", backend.id), ("odoo_id", "in", record_ids)]
+        )
+        binding_ids = {}
+        for binding in bindings:
+            record_id = binding.odoo_id.id
+            assert (
+                record_id not in binding_ids
+            ), "only 1 binding for a backend is supported, got several for %s" % (
+                binding.odoo_id,
+            )
+            binding_ids[record_id] = binding.id
+        return binding_ids
+
+    @api.model
+    @tools.ormcache()
+    def _can_insert_bindings(self):
+        """Return whether the bindings can be inserted with SQL
+
+        See :meth:`_insert_bindings`.
+        """
+        for cls in type(self).__mro__:
+            if "create" not in vars(cls) or cls is models.BaseModel:
+                continue
+            # the overrides of 'base' are the same for all the models
+            inherits = cls._inherit
+            inherits = [inherits] if isinstance(inherits, str) else list(inherits)
+            if set(inherits + [cls._name or "base"]) != {"base"}:
+                return False
+        self.env.cr.execute(
+            """
+            SELECT array_agg(a.attname::text ORDER BY a.attname)
+            FROM pg_index i
+            JOIN pg_attribute a
+            ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = %s::regclass
+            AND i.indisunique
+            AND i.indpred IS NULL
+            AND i.indexprs IS NULL
+            GROUP BY i.indexrelid
+            """,
+            ('"%s"' % self._table,),
+        )
+        return ["backend_id", "odoo_id"] in [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _insert_bindings(self, backend, record_ids, values=None):
+        """Insert bindings for records, ignoring the ones which conflict
+
+        The bindings are inserted with ``INSERT ... ON CONFLICT (backend_id,
+        odoo_id) DO NOTHING`` per chunk of records, with their default
+        values. They are created with the ORM instead when the binding table
+        has no unique constraint on ``(backend_id, odoo_id)``, when the
+        binding model overrides ``create``, when the values are not only
+        columns of the binding table or when the binding model has stored
+        computed fields.
+
+        :return: the IDs of the bindings inserted, by record ID
+        :rtype: dict
+        """
+        vals = dict(values or {}, backend_id=backend.id, odoo_id=record_ids[0])
+        # the defaults of the inherited fields are ignored when the parent
+        # record is given
+        vals = self._add_missing_default_values(vals)
+        fnames = list(vals)
+        binding_fields = [self._fields[fname] for fname in fnames]
+        if (
+            not self._can_insert_bindings()
+            or not all(
+                field.store and field.column_type and not field.inherited
+                for field in binding_fields
+            )
+            or any(
+                field.store and field.compute and not field.inherited
+                for field in self._fields.values()
+            )
+        ):
+            # not columns of the binding table, use the ORM
+            bindings = self.create(
+                [dict(vals, odoo_id=record_id) for record_id in record_ids]
+            )
+            return {binding.odoo_id.id: binding.id for binding in bindings}
+
+        columns = list(fnames)
+        row = ["%s"] * len(columns)
+        row_params = [
+            field.convert_to_column(vals[field.name], self) for field in binding_fields
+        ]
+        odoo_index = columns.index("odoo_id")
+        if self._log_access:
+            columns += ["create_uid", "create_date", "write_uid", "write_date"]
+            row += ["%s", "(now() at time zone 'UTC')"] * 2
+            row_params += [self.env.uid, self.env.uid]
+        query = """
+            INSERT INTO "{table}" ({columns})
+            VALUES {values}
+            ON CONFLICT (backend_id, odoo_id) DO NOTHING
+            RETURNING id, odoo_id
+        """
+        binding_ids = {}
+        for chunk in tools.split_every(self.env.cr.IN_MAX, record_ids):
+            params = []
+            for record_id in chunk:
+                row_params[odoo_index] = record_id
+                params += row_params
+            self.env.cr.execute(
+                query.format(
+                    table=self._table,
+                    columns=", ".join('"%s"' % column for column in columns),
+                    values=", ".join(["(%s)" % ", ".join(row)] * len(chunk)),
+                ),
+                params,
+            )
+            binding_ids.update(
+                (odoo_id, id_) for id_, odoo_id in self.env.cr.fetchall()
+            )
+
+        if binding_ids:
+            bindings = self.browse(list(binding_ids.values()))
+            bindings.modified(fnames, create=True)
+            bindings._validate_fields(fnames)
+            # the one2many fields of the records are not up-to-date
+            odoo_model = self.env[self._fields["odoo_id"].comodel_name]
+            odoo_model.invalidate_cache(ids=list(binding_ids))
+        return binding_ids
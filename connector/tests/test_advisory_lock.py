@@ -9,7 +9,13 @@ from odoo.tests import common
 
 from odoo.addons.component.core import WorkContext
 from odoo.addons.component.tests.common import TransactionComponentCase
-from odoo.addons.connector.database import pg_try_advisory_lock
+from odoo.addons.connector.database import (
+    advisory_lock_key,
+    lock_namespace,
+    pg_connector_locks,
+    pg_try_advisory_lock,
+    pg_try_advisory_locks,
+)
 from odoo.addons.queue_job.exception import RetryableJobError
 
 
@@ -48,7 +54,7 @@ class TestAdvisoryLock(TransactionComponentCase):
             "backend.name", 1, "res.partner", "999999"
         )
 
-        backend = mock.MagicMock()
+        backend = mock.MagicMock(_name="test.backend", id=1)
         backend.env = self.env
         work = WorkContext(model_name="res.partner", collection=backend)
         # we test the function through a Component instance
@@ -58,10 +64,74 @@ class TestAdvisoryLock(TransactionComponentCase):
 
         # instanciate another component using a different odoo env
         # hence another PG transaction
-        backend2 = mock.MagicMock()
+        backend2 = mock.MagicMock(_name="test.backend", id=1)
         backend2.env = self.env2
         work2 = WorkContext(model_name="res.partner", collection=backend2)
         component2 = work2.component_by_name("base.connector")
         with self.assertRaises(RetryableJobError) as cm:
             component2.advisory_lock_or_retry(lock, retry_seconds=3)
             self.assertEqual(cm.exception.seconds, 3)
+
+        # the lock is in the namespace of the backend and the model
+        namespace = "test.backend(1):res.partner"
+        self.assertEqual(component.advisory_lock_namespace(), namespace)
+        locks = pg_connector_locks(self.env2, namespace=namespace)
+        self.assertEqual([lock], [held["name"] for held in locks])
+        # the same name in another namespace is another lock
+        component2.advisory_lock_or_retry(lock, namespace="other")
+
+    def test_concurrent_locks(self):
+        """Many locks are acquired all together or not at all"""
+        locks = [
+            "import_record(backend.name, 1, res.partner, %s)" % i for i in range(3)
+        ]
+        self.assertTrue(pg_try_advisory_locks(self.env, locks[:2]))
+        # one of the locks is held, the others are released at once
+        self.assertFalse(pg_try_advisory_locks(self.env2, locks[1:]))
+        self.assertTrue(pg_try_advisory_lock(self.env, locks[2]))
+        self.assertTrue(pg_try_advisory_locks(self.env, []))
+
+    def test_concurrent_import_locks(self):
+        """A 2nd concurrent transaction must retry on any held lock"""
+        locks = [
+            "import_record(backend.name, 1, res.partner, %s)" % i for i in range(3)
+        ]
+        backend = mock.MagicMock(_name="test.backend", id=1)
+        backend.env = self.env
+        work = WorkContext(model_name="res.partner", collection=backend)
+        component = work.component_by_name("base.connector")
+        component.advisory_locks_or_retry(locks[:1])
+
+        backend2 = mock.MagicMock(_name="test.backend", id=1)
+        backend2.env = self.env2
+        work2 = WorkContext(model_name="res.partner", collection=backend2)
+        component2 = work2.component_by_name("base.connector")
+        with self.assertRaises(RetryableJobError) as cm:
+            component2.advisory_locks_or_retry(locks, retry_seconds=3)
+        self.assertEqual(cm.exception.seconds, 3)
+        component2.advisory_locks_or_retry(locks[1:])
+
+    def test_namespaced_lock(self):
+        """Locks of a namespace are found in pg_locks"""
+        backend = self.env["res.partner"].browse(1)
+        namespace = lock_namespace(backend, "res.partner")
+        self.assertEqual(namespace, "res.partner(1):res.partner")
+        self.assertTrue(pg_try_advisory_lock(self.env, "999999", namespace=namespace))
+        # the same name in another namespace is another lock
+        self.assertTrue(pg_try_advisory_lock(self.env2, "999999"))
+        self.assertFalse(
+            pg_try_advisory_locks(self.env2, ["999998", "999999"], namespace=namespace)
+        )
+
+        locks = pg_connector_locks(self.env2, namespace=namespace)
+        self.assertEqual(len(locks), 1)
+        lock = locks[0]
+        self.assertEqual(lock["key"], advisory_lock_key("999999", namespace))
+        self.assertEqual(lock["namespace"], namespace)
+        self.assertEqual(lock["name"], "999999")
+        self.assertTrue(lock["granted"])
+        self.env.cr.execute("SELECT pg_backend_pid()")
+        self.assertEqual(lock["pid"], self.env.cr.fetchone()[0])
+        all_locks = pg_connector_locks(self.env2)
+        self.assertIn(lock["key"], [lock["key"] for lock in all_locks])
+        self.assertIn("connector", [lock["namespace"] for lock in all_locks])
@@ -9,6 +9,7 @@ from odoo.tests import common
 
 from odoo.addons.component.core import WorkContext
 from odoo.addons.component.tests.common import TransactionComponentRegistryCase
+from odoo.addons.connector.database import lock_wait_metrics
 from odoo.addons.queue_job.exception import RetryableJobError
 
 
@@ -42,3 +43,39 @@ class TestLocker(TransactionComponentRegistryCase):
         locker2 = work2.component("record.locker")
         with self.assertRaises(RetryableJobError):
             locker2.lock(main_partner2)
+
+    def test_lock_available(self):
+        """Lock the records not locked by another transaction"""
+        partners = self.env["res.partner"].search([], limit=3)
+        work = WorkContext(model_name="res.partner", collection=self.backend)
+        locked = work.component("record.locker").lock_available(partners[:1])
+        self.assertEqual(locked, partners[:1])
+
+        partners2 = partners.with_env(self.env2)
+        work2 = WorkContext(model_name="res.partner", collection=self.backend2)
+        locker2 = work2.component("record.locker")
+        locked2 = locker2.lock_available(partners2)
+        self.assertEqual(locked2, partners2[1:])
+        self.assertFalse(locker2.lock_available(partners2.browse()))
+
+    def test_lock_timeout(self):
+        """Wait for a locked record, then fail and record the wait"""
+        lock_wait_metrics.reset()
+        self.env.cr.execute("SHOW lock_timeout")
+        previous = self.env.cr.fetchone()[0]
+        main_partner = self.env.ref("base.main_partner")
+        work = WorkContext(model_name="res.partner", collection=self.backend)
+        work.component("record.locker").lock(main_partner)
+
+        main_partner2 = self.env2.ref("base.main_partner")
+        work2 = WorkContext(model_name="res.partner", collection=self.backend2)
+        locker2 = work2.component("record.locker")
+        with self.assertRaises(RetryableJobError):
+            locker2.lock(main_partner2, lock_timeout=0.1)
+        metric = lock_wait_metrics.get()["res.partner"]
+        self.assertEqual(metric["count"], 2)
+        self.assertEqual(metric["failed"], 1)
+        self.assertGreaterEqual(metric["max_wait"], 0.1)
+        # the lock_timeout is restored once the records are locked
+        self.env.cr.execute("SHOW lock_timeout")
+        self.assertEqual(self.env.cr.fetchone()[0], previous)
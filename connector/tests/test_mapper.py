@@ -10,6 +10,7 @@ from odoo.addons.connector.components.mapper import (
     MappingDefinition,
     changed_by,
     convert,
+    drop_memoized_values,
     external_to_m2o,
     follow_m2o_relations,
     m2o_to_external,
@@ -393,6 +394,196 @@ class TestMapper(TransactionComponentRegistryCase):
             map_record.values(for_create=True, fields=["name", "country"]), expected
         )
 
+    def test_mapping_plan(self):
+        """The mappings to apply are computed once per options"""
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+
+            direct = [(none("name"), "out_name"), ("street", "out_street")]
+
+            @changed_by("country")
+            @mapping
+            def country(self, record):
+                return {"country": "country"}
+
+            @only_create
+            @mapping
+            def state(self, record):
+                return {"state": "draft"}
+
+        self._build_components(MyMapper)
+
+        record = {"name": "Guewen", "street": "street", "country": "country"}
+        work = mock.MagicMock(name="WorkContext()")
+        mapper = self.comp_registry["my.mapper"](work)
+        map_record = mapper.map_record(record)
+        expected = {"out_name": "Guewen", "country": "country"}
+        self.assertEqual(map_record.values(fields=["name", "country"]), expected)
+        self.assertEqual(1, len(mapper._mapping_plans))
+        plan = mapper._mapping_plans[
+            (work.model_name, frozenset(["name", "country"]), False)
+        ]
+        self.assertEqual(["out_name"], [to_attr for __, to_attr, __ in plan.direct])
+        self.assertEqual([MyMapper.country], list(plan.methods))
+
+        # the plan is reused, no need to resolve the source fields again
+        with mock.patch.object(
+            type(mapper), "_direct_source_field_name"
+        ) as source_field_name:
+            map_record = mapper.map_record(record)
+            self.assertEqual(map_record.values(fields=["country", "name"]), expected)
+            source_field_name.assert_not_called()
+        self.assertEqual(1, len(mapper._mapping_plans))
+
+        expected = {
+            "out_name": "Guewen",
+            "out_street": "street",
+            "country": "country",
+            "state": "draft",
+        }
+        self.assertEqual(map_record.values(for_create=True), expected)
+        self.assertEqual(2, len(mapper._mapping_plans))
+
+    def test_map_columns(self):
+        """Map records given as columns"""
+
+        def upper(field):
+            def modifier(self, record, to_attr):
+                return record[field].upper()
+
+            return modifier
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+
+            direct = [
+                ("name", "out_name"),
+                (convert("code", int), "out_code"),
+                (none("street"), "out_street"),
+                (upper("name"), "upper_name"),
+                ("missing", "out_missing"),
+            ]
+
+            @mapping
+            def city(self, record):
+                return {"out_city": "%s/%s" % (record["city"], record["name"])}
+
+        self._build_components(MyMapper)
+
+        columns = {
+            "name": ["Guewen", "Joel"],
+            "code": ["1", ""],
+            "street": ["", "street"],
+            "city": ["Lausanne", "Bern"],
+        }
+        work = mock.MagicMock(name="WorkContext()")
+        mapper = self.comp_registry["my.mapper"](work)
+        expected = [
+            {
+                "out_name": "Guewen",
+                "out_code": 1,
+                "out_street": None,
+                "upper_name": "GUEWEN",
+                "out_missing": False,
+                "out_city": "Lausanne/Guewen",
+            },
+            {
+                "out_name": "Joel",
+                "out_code": False,
+                "out_street": "street",
+                "upper_name": "JOEL",
+                "out_missing": False,
+                "out_city": "Bern/Joel",
+            },
+        ]
+        self.assertEqual(mapper.map_columns(columns), expected)
+        # same result than with rows
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        self.assertEqual(mapper.map_records(rows), expected)
+
+        with self.assertRaises(ValueError):
+            mapper.map_columns({"name": ["Guewen"], "code": []})
+
+    def test_map_columns_custom_map_direct(self):
+        """A customized _map_direct is applied on the rows of the columns"""
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+
+            direct = [("name", "out_name"), ("missing", "out_missing")]
+
+            def _map_direct(self, record, from_attr, to_attr):
+                return "x-%s" % (record.get(from_attr),)
+
+        self._build_components(MyMapper)
+
+        columns = {"name": ["Guewen", ""]}
+        work = mock.MagicMock(name="WorkContext()")
+        mapper = self.comp_registry["my.mapper"](work)
+        expected = [
+            {"out_name": "x-Guewen", "out_missing": "x-None"},
+            {"out_name": "x-", "out_missing": "x-None"},
+        ]
+        self.assertEqual(mapper.map_columns(columns), expected)
+        rows = [{"name": "Guewen"}, {"name": ""}]
+        self.assertEqual(mapper.map_records(rows), expected)
+
+    def test_mapping_memoize(self):
+        """The values of an Odoo record are memoized by fingerprint"""
+        calls = []
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.export.mapper"
+            _apply_on = "res.partner"
+            _memoize = True
+
+            direct = [("name", "out_name")]
+
+            @changed_by("ref")
+            @mapping
+            def ref(self, record):
+                calls.append(record)
+                return {"out_ref": record.ref}
+
+        self._build_components(MyMapper)
+
+        partner = self.env["res.partner"].create({"name": "Guewen", "ref": "A"})
+        work = mock.MagicMock(name="WorkContext()")
+        mapper = self.comp_registry["my.mapper"](work)
+        fingerprint = mapper.fingerprint(partner)
+        expected = {"out_name": "Guewen", "out_ref": "A"}
+        self.assertEqual(mapper.map_record(partner).values(), expected)
+        self.assertEqual(mapper.map_record(partner).values(), expected)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(fingerprint, mapper.fingerprint(partner))
+
+        # the forced values are not memoized
+        map_record = mapper.map_record(partner)
+        map_record.update(out_name="Joel")
+        self.assertEqual(map_record.values(), {"out_name": "Joel", "out_ref": "A"})
+        self.assertEqual(mapper.map_record(partner).values(), expected)
+        self.assertEqual(1, len(calls))
+
+        # a change of the options or of the record maps it again
+        mapper.map_record(partner).values(for_create=True)
+        self.assertEqual(2, len(calls))
+        partner.ref = "B"
+        self.assertNotEqual(fingerprint, mapper.fingerprint(partner))
+        self.assertEqual(
+            mapper.map_record(partner).values(), {"out_name": "Guewen", "out_ref": "B"}
+        )
+        self.assertEqual(3, len(calls))
+
+        # the memoized values are dropped at the end of the transaction
+        drop_memoized_values(work.env.cr)
+        mapper.map_record(partner).values()
+        self.assertEqual(4, len(calls))
+
     def test_mapping_modifier(self):
         """Map a direct record with a modifier function"""
 
@@ -752,6 +943,66 @@ class TestMapperBinding(TransactionComponentRegistryCase):
         self.assertEqual(map_record.values(), {"country_id": ch.id})
         self.country_binder.to_internal.assert_called_once_with(10, unwrap=False)
 
+    def test_mapping_implicit_m2o(self):
+        """Map a many2one without modifier, decided once per plan"""
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+            _apply_on = "res.partner"
+
+            direct = [("country", "country_id"), ("name", "name")]
+
+        self._build_components(MyMapper)
+
+        record = {"country": 10, "name": "Foo"}
+        ch = self.env.ref("base.ch")
+        self.country_binder.to_internal.return_value = ch
+        mapper = self.comp_registry["my.mapper"](self.work)
+        expected = {"country_id": ch.id, "name": "Foo"}
+        self.assertEqual(mapper.map_record(record).values(), expected)
+        self.country_binder.to_internal.assert_called_once_with(10, unwrap=False)
+
+        # the functions applying the direct mappings are kept in the plan
+        with mock.patch.object(type(mapper), "_map_direct") as map_direct:
+            self.assertEqual(mapper.map_record(record).values(), expected)
+            map_direct.assert_not_called()
+
+    def test_map_records_backend_to_m2o(self):
+        """Map many records, the bindings are found at once"""
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+            _apply_on = "res.partner"
+
+            direct = [(external_to_m2o("country"), "country_id"), ("name", "name")]
+
+        self._build_components(MyMapper)
+
+        records = [
+            {"country": 10, "name": "A"},
+            {"country": 11, "name": "B"},
+            {"country": 10, "name": "C"},
+            {"country": False, "name": "D"},
+        ]
+        ch = self.env.ref("base.ch")
+        self.country_binder.to_internal.return_value = ch
+        mapper = self.comp_registry["my.mapper"](self.work)
+        values = mapper.map_records(records, for_create=True)
+        self.assertEqual(
+            values,
+            [
+                {"country_id": ch.id, "name": "A"},
+                {"country_id": ch.id, "name": "B"},
+                {"country_id": ch.id, "name": "C"},
+                {"country_id": False, "name": "D"},
+            ],
+        )
+        self.country_binder.to_internal_many.assert_called_once_with(
+            [10, 11], unwrap=False
+        )
+
     def test_mapping_record_children_no_map_child(self):
         """Map a record with children, using default MapChild"""
         # we need these components which make the 'link' between
@@ -876,6 +1127,115 @@ class TestMapperBinding(TransactionComponentRegistryCase):
         }
         self.assertEqual(map_record.values(for_create=True), expected)
 
+    def test_map_records_children(self):
+        """Map many records with children, the bindings are found at once"""
+
+        class LineMapper(Component):
+            _name = "line.mapper"
+            _inherit = "base.import.mapper"
+            _apply_on = "res.currency.rate"
+
+            direct = [
+                (external_to_m2o("country", binding="res.country"), "currency_id")
+            ]
+
+        class LineImportMapChild(Component):
+            _name = "line.map.child.import"
+            _inherit = "base.map.child.import"
+            _apply_on = "res.currency.rate"
+
+            def skip_item(self, map_record):
+                return map_record.source["country"] == 99
+
+            def format_items(self, items_values):
+                # the values are still given as a list
+                assert isinstance(items_values, list)
+                return super(LineImportMapChild, self).format_items(items_values)
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+            _apply_on = "res.currency"
+
+            direct = [("name", "name")]
+
+            children = [("lines", "line_ids", "res.currency.rate")]
+
+        self._build_components(LineMapper, LineImportMapChild, MyMapper)
+
+        records = [
+            {"name": "SO1", "lines": [{"country": 10}, {"country": 11}]},
+            {"name": "SO2", "lines": [{"country": 12}, {"country": 99}]},
+        ]
+        ch = self.env.ref("base.ch")
+        self.country_binder.to_internal.return_value = ch
+        mapper = self.comp_registry["my.mapper"](self.work)
+        expected = [
+            {
+                "name": "SO1",
+                "line_ids": [(0, 0, {"currency_id": ch.id})] * 2,
+            },
+            {"name": "SO2", "line_ids": [(0, 0, {"currency_id": ch.id})]},
+        ]
+        self.assertEqual(mapper.map_records(records), expected)
+        # the bindings of the lines of all the records are searched first,
+        # without the skipped lines
+        self.assertEqual(
+            mock.call([10, 11, 12], unwrap=True),
+            self.country_binder.to_internal_many.call_args_list[0],
+        )
+
+    def test_map_records_children_lookup(self):
+        """The MapChild and the mapper of the items are looked up once"""
+
+        class LineMapper(Component):
+            _name = "line.mapper"
+            _inherit = "base.import.mapper"
+            _apply_on = "res.currency.rate"
+
+            direct = [("rate", "rate")]
+
+        class MyMapper(Component):
+            _name = "my.mapper"
+            _inherit = "base.import.mapper"
+            _apply_on = "res.currency"
+
+            direct = [("name", "name")]
+
+            children = [("lines", "line_ids", "res.currency.rate")]
+
+        self._build_components(LineMapper, MyMapper)
+
+        records = [
+            {"name": "SO1", "lines": [{"rate": 1}, {"rate": 2}]},
+            {"name": "SO2", "lines": [{"rate": 3}]},
+        ]
+        map_child_class = self.comp_registry["base.map.child.import"]
+        mapper = self.comp_registry["my.mapper"](self.work)
+        with mock.patch.object(
+            map_child_class,
+            "_child_mapper",
+            autospec=True,
+            side_effect=map_child_class._child_mapper,
+        ) as child_mapper, mock.patch.object(
+            map_child_class,
+            "format_items_stream",
+            autospec=True,
+            side_effect=map_child_class.format_items_stream,
+        ) as format_items_stream:
+            values = mapper.map_records(records)
+        self.assertEqual(
+            values,
+            [
+                {"name": "SO1", "line_ids": [(0, 0, {"rate": 1}), (0, 0, {"rate": 2})]},
+                {"name": "SO2", "line_ids": [(0, 0, {"rate": 3})]},
+            ],
+        )
+        self.assertEqual(child_mapper.call_count, 1)
+        # the values of the items are given as an iterator
+        items_values = format_items_stream.call_args[0][1]
+        self.assertFalse(isinstance(items_values, list))
+
     def test_mapping_record_children_void(self):
         """Map a record with children, using defined MapChild"""
 
@@ -10,6 +10,45 @@ class ConnectorTestBinder(Component):
     _apply_on = ["connector.test.binding"]
 
 
+class ConnectorTestAdapter(Component):
+    _name = "connector.test.adapter"
+    _inherit = ["base.backend.adapter.crud"]
+    _apply_on = ["connector.test.binding"]
+
+
+class ConnectorTestImportMapper(Component):
+    _name = "connector.test.import.mapper"
+    _inherit = ["base.import.mapper"]
+    _apply_on = ["connector.test.binding"]
+
+    direct = [("name", "name")]
+
+
+class ConnectorTestImporter(Component):
+    _name = "connector.test.importer"
+    _inherit = ["generic.importer"]
+    _apply_on = ["connector.test.binding"]
+
+
+class ConnectorTestExportMapper(Component):
+    _name = "connector.test.export.mapper"
+    _inherit = ["base.export.mapper"]
+    _apply_on = ["connector.test.binding"]
+
+    direct = [("name", "name"), ("code", "code")]
+
+
+class ConnectorTestExporter(Component):
+    _name = "connector.test.exporter"
+    _inherit = ["generic.exporter"]
+    _apply_on = ["connector.test.binding"]
+    _usage = "record.exporter"
+    _default_binding_field = "bind_ids"
+
+    def _export_dependencies(self):
+        self._export_dependency(self.binding.parent_id, "connector.test.binding")
+
+
 class NoInheritsBinder(Component):
     _name = "connector.test.no.inherits.binder"
     _inherit = ["base.binder"]
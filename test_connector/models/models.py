@@ -1,7 +1,8 @@
 # Copyright 2016 Camptocamp SA
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html)
 
-from odoo import fields, models
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
 
 
 class TestBackend(models.Model):
@@ -15,6 +16,26 @@ class ConnectorTestRecord(models.Model):
     _name = "connector.test.record"
     _description = "Records for testing Connector"
 
+    name = fields.Char()
+    code = fields.Char()
+    parent_id = fields.Many2one(comodel_name="connector.test.record")
+    bind_ids = fields.One2many(
+        comodel_name="connector.test.binding", inverse_name="odoo_id"
+    )
+
+    _sql_constraints = [
+        (
+            "name_check",
+            "CHECK(name IS NULL OR name != 'sql invalid')",
+            "Invalid name",
+        )
+    ]
+
+    @api.constrains("name")
+    def _check_name(self):
+        if any(record.name == "invalid" for record in self):
+            raise ValidationError(_("Invalid name"))
+
 
 class ConnectorTestBinding(models.Model):
     _name = "connector.test.binding"
@@ -29,6 +50,8 @@ class ConnectorTestBinding(models.Model):
         ondelete="restrict",
     )
     external_id = fields.Integer(string="ID on External")
+    export_fingerprint = fields.Char()
+    export_hashes = fields.Text()
     odoo_id = fields.Many2one(
         comodel_name="connector.test.record",
         string="Test Record",
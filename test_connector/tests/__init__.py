@@ -1,2 +1,4 @@
 from . import test_default_binder
+from . import test_generic_exporter
+from . import test_generic_importer
 from . import test_related_action_binding
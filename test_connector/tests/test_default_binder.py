@@ -1,6 +1,10 @@
 # Copyright 2013-2017 Camptocamp SA
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html)
 
+import mock
+
+from odoo.exceptions import AccessError
+
 from odoo.addons.component.tests.common import TransactionComponentCase
 
 
@@ -42,3 +46,154 @@ class TestDefaultBinder(TransactionComponentCase):
             self.assertEqual(self.binder.unwrap_model(), "connector.test.record")
             # unwrapping the binding should give the same binding
             self.assertEqual(self.binder.unwrap_binding(test_binding), test_record)
+
+    def test_default_binder_many(self):
+        """Batch lookups with the default binder"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            records = self.env["connector.test.record"].create([{}, {}, {}])
+            bindings = self.env["connector.test.binding"].create(
+                [
+                    {"backend_id": self.backend_record.id, "odoo_id": record.id}
+                    for record in records
+                ]
+            )
+            binder.bind(98, bindings[0])
+            binder.bind(99, bindings[1])
+
+            result = binder.to_internal_many([98, 99, 100])
+            self.assertEqual(result[98], bindings[0])
+            self.assertEqual(result[99], bindings[1])
+            self.assertFalse(result[100])
+            result = binder.to_internal_many([98, 99, 100], unwrap=True)
+            self.assertEqual(result[98], records[0])
+            self.assertEqual(result[99], records[1])
+            self.assertFalse(result[100])
+
+            result = binder.to_external_many(bindings)
+            self.assertEqual(
+                result, {bindings[0].id: 98, bindings[1].id: 99, bindings[2].id: 0}
+            )
+            result = binder.to_external_many(records, wrap=True)
+            self.assertEqual(
+                result, {records[0].id: 98, records[1].id: 99, records[2].id: 0}
+            )
+
+            # the bindings are kept in the identity map of the transaction,
+            # only their existence is checked
+            with self.assertQueryCount(2):
+                binder.to_internal_many([98, 99])
+                binder.to_external(records[0], wrap=True)
+
+            # binding to a new external ID updates the identity map
+            binder.bind(101, bindings[0])
+            self.assertFalse(binder.to_internal(98))
+            self.assertEqual(binder.to_internal(101), bindings[0])
+
+    def test_default_binder_bind_many(self):
+        """Bind many bindings at once"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            records = self.env["connector.test.record"].create([{}, {}])
+            bindings = self.env["connector.test.binding"].create(
+                [
+                    {"backend_id": self.backend_record.id, "odoo_id": record.id}
+                    for record in records
+                ]
+            )
+            binder.bind(97, bindings[0])
+            binder.bind_many([(98, bindings[0]), (99, bindings[1].id)])
+            self.assertEqual(bindings[0].external_id, 98)
+            self.assertEqual(bindings[1].external_id, 99)
+            self.assertTrue(bindings[1].sync_date)
+            self.assertFalse(binder.to_internal(97))
+            self.assertEqual(binder.to_internal(98), bindings[0])
+            self.assertEqual(binder.to_internal(99, unwrap=True), records[1])
+
+    def test_default_binder_bind_many_access(self):
+        """The access rules are checked before binding many bindings"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            record = self.env["connector.test.record"].create({})
+            binding = self.env["connector.test.binding"].create(
+                {"backend_id": self.backend_record.id, "odoo_id": record.id}
+            )
+            with mock.patch.object(
+                type(binding), "check_access_rule", side_effect=AccessError("no")
+            ):
+                with self.assertRaises(AccessError):
+                    binder.bind_many([(98, binding)])
+            self.assertFalse(binding.external_id)
+
+    def test_default_binder_write(self):
+        """The binders do not find a binding by its old external ID"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            record = self.env["connector.test.record"].create({})
+            binding = self.env["connector.test.binding"].create(
+                {"backend_id": self.backend_record.id, "odoo_id": record.id}
+            )
+            binder.bind(99, binding)
+            self.assertEqual(binder.to_internal(99), binding)
+            self.assertEqual(binder.to_external(record, wrap=True), 99)
+            binding.write({"external_id": 100})
+            self.assertFalse(binder.to_internal(99))
+            self.assertEqual(binder.to_internal(100), binding)
+            self.assertEqual(binder.to_external(record, wrap=True), 100)
+
+    def test_default_binder_cascade(self):
+        """The binders do not find a binding deleted by a cascade"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            record = self.env["connector.test.record"].create({})
+            binding = self.env["connector.test.binding"].create(
+                {"backend_id": self.backend_record.id, "odoo_id": record.id}
+            )
+            binder.bind(99, binding)
+            self.assertEqual(binder.to_internal(99), binding)
+            self.assertEqual(binder.to_external(record, wrap=True), 99)
+            # deleted in the database, without unlink
+            self.env.cr.execute(
+                "DELETE FROM connector_test_binding WHERE id = %s", (binding.id,)
+            )
+            self.assertFalse(binder.to_internal(99))
+            self.assertIsNone(binder.to_external(record, wrap=True))
+
+    def test_get_or_create_bindings(self):
+        """Bindings are created with the ORM without unique constraint"""
+        Binding = self.env["connector.test.binding"]
+        Binding.clear_caches()
+        self.assertFalse(Binding._can_insert_bindings())
+        self._check_get_or_create_bindings()
+
+    def test_get_or_create_bindings_upsert(self):
+        """Bindings are inserted with SQL with a unique constraint"""
+        Binding = self.env["connector.test.binding"]
+        self.env.cr.execute(
+            "CREATE UNIQUE INDEX connector_test_binding_odoo_uniq "
+            "ON connector_test_binding (backend_id, odoo_id)"
+        )
+        Binding.clear_caches()
+        self.addCleanup(Binding.clear_caches)
+        self.assertTrue(Binding._can_insert_bindings())
+        self._check_get_or_create_bindings()
+
+    def _check_get_or_create_bindings(self):
+        records = self.env["connector.test.record"].create([{}, {}, {}])
+        existing = self.env["connector.test.binding"].create(
+            {"backend_id": self.backend_record.id, "odoo_id": records[1].id}
+        )
+        bindings = self.env["connector.test.binding"]._get_or_create_bindings(
+            self.backend_record, records, values={"sync_date": "2020-01-01"}
+        )
+        self.assertEqual(bindings.odoo_id, records)
+        self.assertEqual(bindings[1], existing)
+        self.assertEqual(bindings.mapped("backend_id"), self.backend_record)
+        self.assertEqual(str(bindings[0].sync_date), "2020-01-01 00:00:00")
+        self.assertFalse(bindings[1].sync_date)
+        self.assertEqual(bindings[0].create_uid, self.env.user)
+        # no binding is created twice
+        again = self.env["connector.test.binding"]._get_or_create_bindings(
+            self.backend_record, records | records[0]
+        )
+        self.assertEqual(again, bindings)
@@ -0,0 +1,369 @@
+# Copyright 2021 Camptocamp SA
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html)
+
+import json
+from contextlib import contextmanager
+
+import mock
+import psycopg2
+
+from odoo.addons.component.tests.common import TransactionComponentCase
+from odoo.addons.connector.components.synchronizer import DependencyGraph
+from odoo.addons.queue_job.exception import RetryableJobError
+
+
+class TestGenericExporter(TransactionComponentCase):
+    """Test the exports of the generic exporter"""
+
+    def setUp(self):
+        super(TestGenericExporter, self).setUp()
+        self.backend_record = self.env["test.backend"].create({})
+        Record = self.env["connector.test.record"]
+        self.record_c = Record.create({"name": "C"})
+        self.record_b = Record.create({"name": "B", "parent_id": self.record_c.id})
+        self.record_a = Record.create({"name": "A", "parent_id": self.record_b.id})
+        self.binding_a = self.env["connector.test.binding"].create(
+            {"backend_id": self.backend_record.id, "odoo_id": self.record_a.id}
+        )
+
+    def _node(self, record):
+        return ("connector.test.binding", record.bind_ids.id)
+
+    def test_plan_dependencies(self):
+        """The missing dependencies are planned, their bindings created"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            exporter.binding = self.binding_a
+            graph = exporter._plan_dependencies()
+        self.assertEqual(len(self.record_b.bind_ids), 1)
+        self.assertEqual(len(self.record_c.bind_ids), 1)
+        node_b = self._node(self.record_b)
+        node_c = self._node(self.record_c)
+        self.assertEqual(graph.dependencies, {node_b: {node_c}, node_c: set()})
+        self.assertEqual(
+            graph.usages,
+            {node_b: "record.exporter", node_c: "record.exporter"},
+        )
+        self.assertEqual(graph.leaves(), [node_c])
+
+    def test_graph_leaves(self):
+        """The leaves are returned in the order they are planned"""
+        graph = DependencyGraph()
+        graph.add(None, ("a", 1), "record.exporter")
+        graph.add(("a", 1), ("b", 2), "record.exporter")
+        graph.add(None, ("c", 3), "record.exporter")
+        graph.add(("a", 1), ("c", 3), "other.exporter")
+        self.assertEqual(graph.leaves(), [("b", 2), ("c", 3)])
+        self.assertEqual(graph.usages[("c", 3)], "record.exporter")
+        self.assertEqual(len(graph), 3)
+
+    def test_concurrent_dependencies(self):
+        """The dependencies are exported level by level in other jobs"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            exporter = work.component(usage="record.exporter")
+            exporter_class = type(exporter)
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(
+                exporter_class, "_concurrent_dependencies", True
+            ), mock.patch.object(
+                exporter_class, "_delay_export_dependency", return_value=True
+            ) as delay, mock.patch.object(
+                adapter_class, "create", return_value=1
+            ) as create:
+                with self.assertRaises(RetryableJobError) as cm:
+                    exporter.run(self.binding_a)
+                # a new job has been delayed, the retry is not counted
+                self.assertTrue(cm.exception.ignore_retry)
+                self.assertEqual(cm.exception.seconds, 10)
+                delay.assert_called_once_with(self.record_c.bind_ids, "record.exporter")
+
+                # the dependency is still being exported
+                delay.return_value = False
+                with self.assertRaises(RetryableJobError) as cm:
+                    work.component(usage="record.exporter").run(self.binding_a)
+                self.assertFalse(cm.exception.ignore_retry)
+                delay.return_value = True
+
+                binder.bind(3, self.record_c.bind_ids)
+                delay.reset_mock()
+                with self.assertRaises(RetryableJobError):
+                    work.component(usage="record.exporter").run(self.binding_a)
+                delay.assert_called_once_with(self.record_b.bind_ids, "record.exporter")
+
+                binder.bind(2, self.record_b.bind_ids)
+                delay.reset_mock()
+                work.component(usage="record.exporter").run(self.binding_a)
+                delay.assert_not_called()
+                create.assert_called_once_with({"name": "A", "code": False})
+        self.assertEqual(self.binding_a.external_id, 1)
+
+    def test_delay_export_dependency(self):
+        """A job exports the dependency, only one job per dependency"""
+        binding_c = self.env["connector.test.binding"].create(
+            {"backend_id": self.backend_record.id, "odoo_id": self.record_c.id}
+        )
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            self.assertTrue(
+                exporter._delay_export_dependency(binding_c, "record.exporter")
+            )
+            self.assertFalse(
+                exporter._delay_export_dependency(binding_c, "record.exporter")
+            )
+        jobs = self.env["queue.job"].search(
+            [("model_name", "=", "connector.test.binding")]
+        )
+        self.assertEqual(jobs.mapped("method_name"), ["export_dependency"])
+        self.assertEqual(jobs.record_ids, binding_c.ids)
+
+        with self.backend_record.work_on("connector.test.binding") as work:
+            adapter_class = type(work.component(usage="backend.adapter"))
+            with mock.patch.object(adapter_class, "create", return_value=3):
+                binding_c.export_dependency()
+        self.assertEqual(binding_c.external_id, 3)
+
+    def test_concurrent_dependencies_cyclic(self):
+        """Cyclic dependencies are exported synchronously"""
+        graph = DependencyGraph()
+        graph.add(None, ("connector.test.binding", 1), "record.exporter")
+        graph.add(
+            ("connector.test.binding", 1),
+            ("connector.test.binding", 2),
+            "record.exporter",
+        )
+        graph.add(
+            ("connector.test.binding", 2),
+            ("connector.test.binding", 1),
+            "record.exporter",
+        )
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            exporter_class = type(exporter)
+            with mock.patch.object(
+                exporter_class, "_plan_dependencies", return_value=graph
+            ), mock.patch.object(
+                exporter_class, "_export_dependencies"
+            ) as export, mock.patch.object(
+                exporter_class, "_delay_export_dependency"
+            ) as delay:
+                exporter.binding = self.binding_a
+                exporter._export_dependencies_concurrently()
+        export.assert_called_once_with()
+        delay.assert_not_called()
+
+    def test_fingerprint(self):
+        """Unchanged records are skipped, but not after partial exports"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            work.component(usage="binder").bind(1, self.binding_a)
+            exporter = work.component(usage="record.exporter")
+            exporter_class = type(exporter)
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(
+                exporter_class, "_fingerprint_field", "export_fingerprint"
+            ), mock.patch.object(adapter_class, "write") as write:
+                exporter.run(self.binding_a)
+                write.assert_called_once_with(1, {"name": "A", "code": False})
+                fingerprint = self.binding_a.export_fingerprint
+                self.assertTrue(fingerprint)
+
+                write.reset_mock()
+                result = exporter.run(self.binding_a)
+                self.assertEqual(result, "Nothing to export.")
+                write.assert_not_called()
+
+                self.record_a.write({"name": "A2", "code": "X"})
+                exporter.run(self.binding_a, fields=["name"])
+                write.assert_called_once_with(1, {"name": "A2"})
+                # code has not been exported yet
+                self.assertEqual(self.binding_a.export_fingerprint, fingerprint)
+                write.reset_mock()
+                exporter.run(self.binding_a, fields=["code"])
+                write.assert_called_once_with(1, {"code": "X"})
+
+                write.reset_mock()
+                exporter.run(self.binding_a)
+                write.assert_called_once_with(1, {"name": "A2", "code": "X"})
+                self.assertNotEqual(self.binding_a.export_fingerprint, fingerprint)
+                write.reset_mock()
+                exporter.run(self.binding_a)
+                write.assert_not_called()
+
+    def test_payload_hashes(self):
+        """The updates send only the changed keys"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            work.component(usage="binder").bind(1, self.binding_a)
+            exporter = work.component(usage="record.exporter")
+            exporter_class = type(exporter)
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(
+                exporter_class, "_payload_hashes_field", "export_hashes"
+            ), mock.patch.object(adapter_class, "write") as write:
+                exporter.run(self.binding_a)
+                write.assert_called_once_with(1, {"name": "A", "code": False})
+                hashes = json.loads(self.binding_a.export_hashes)
+                self.assertEqual(set(hashes), {"name", "code"})
+
+                write.reset_mock()
+                self.record_a.code = "X"
+                exporter.run(self.binding_a)
+                write.assert_called_once_with(1, {"code": "X"})
+                new_hashes = json.loads(self.binding_a.export_hashes)
+                self.assertEqual(new_hashes["name"], hashes["name"])
+                self.assertNotEqual(new_hashes["code"], hashes["code"])
+
+    def _create_bindings(self, names):
+        records = self.env["connector.test.record"].create(
+            [{"name": name} for name in names]
+        )
+        return self.env["connector.test.binding"].create(
+            [
+                {"backend_id": self.backend_record.id, "odoo_id": record.id}
+                for record in records
+            ]
+        )
+
+    def test_adapter_many(self):
+        """The default create_many and write_many return the errors"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            adapter = work.component(usage="backend.adapter")
+            error = ValueError("bad")
+            with mock.patch.object(
+                type(adapter), "create", side_effect=[1, error]
+            ), mock.patch.object(type(adapter), "write", side_effect=[error, None]):
+                self.assertEqual(adapter.create_many([{"a": 1}, {"a": 2}]), [1, error])
+                self.assertEqual(
+                    adapter.write_many([(1, {"a": 1}), (2, {"a": 2})]), [error, None]
+                )
+
+    def test_run_batch(self):
+        """The bindings are exported at once, the errors are isolated"""
+        bindings = self._create_bindings(["new", "bad", "exported"])
+        error = ValueError("bad")
+        with self.backend_record.work_on("connector.test.binding") as work:
+            work.component(usage="binder").bind(5, bindings[2])
+            exporter = work.component(usage="record.exporter")
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(
+                adapter_class, "create_many", return_value=[10, error]
+            ) as create_many, mock.patch.object(
+                adapter_class, "write_many", return_value=[None]
+            ) as write_many:
+                errors = exporter.run_batch(bindings)
+        create_many.assert_called_once_with(
+            [{"name": "new", "code": False}, {"name": "bad", "code": False}]
+        )
+        write_many.assert_called_once_with([(5, {"name": "exported", "code": False})])
+        self.assertEqual(errors, {bindings[1].id: error})
+        self.assertEqual(bindings.mapped("external_id"), [10, 0, 5])
+        self.assertTrue(bindings[0].sync_date)
+        self.assertFalse(bindings[1].sync_date)
+
+    def test_run_batch_prefetch_error(self):
+        """A failure to prepare the mapping of a chunk is not fatal"""
+        bindings = self._create_bindings(["A", "B"])
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(
+                type(exporter.mapper), "prefetch_records", side_effect=KeyError("x")
+            ), mock.patch.object(adapter_class, "create_many", return_value=[1, 2]):
+                errors = exporter.run_batch(bindings)
+        self.assertFalse(errors)
+        self.assertEqual(bindings.mapped("external_id"), [1, 2])
+
+    def test_run_batch_missing_results(self):
+        """The adapter must return a result per record"""
+        bindings = self._create_bindings(["A", "B"])
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(adapter_class, "create_many", return_value=[1]):
+                with self.assertRaises(ValueError):
+                    exporter.run_batch(bindings)
+
+    def test_run_batch_export_state(self):
+        """The fingerprints and hashes of a chunk are stored"""
+        bindings = self._create_bindings(["A", "B"])
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            exporter_class = type(exporter)
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch.object(
+                exporter_class, "_fingerprint_field", "export_fingerprint"
+            ), mock.patch.object(
+                exporter_class, "_payload_hashes_field", "export_hashes"
+            ), mock.patch.object(
+                adapter_class, "create_many", return_value=[1, 2]
+            ), mock.patch.object(
+                adapter_class, "write_many", return_value=[None]
+            ) as write_many:
+                exporter.run_batch(bindings)
+                self.assertTrue(all(bindings.mapped("export_fingerprint")))
+                hashes = [
+                    json.loads(value) for value in bindings.mapped("export_hashes")
+                ]
+                self.assertEqual(set(hashes[0]), {"name", "code"})
+                self.assertNotEqual(hashes[0]["name"], hashes[1]["name"])
+
+                # unchanged records are skipped
+                self.assertFalse(exporter.run_batch(bindings))
+                write_many.assert_not_called()
+
+                bindings[1].odoo_id.code = "X"
+                exporter.run_batch(bindings)
+                write_many.assert_called_once_with([(2, {"code": "X"})])
+                self.assertEqual(
+                    json.loads(bindings[1].export_hashes)["name"], hashes[1]["name"]
+                )
+
+    def test_run_batch_dependency_contention(self):
+        """A dependency locked by a concurrent job fails only its binding"""
+        record = self.env["connector.test.record"].create(
+            {"name": "X", "parent_id": self.record_c.id}
+        )
+        bindings = self.env["connector.test.binding"].create(
+            {"backend_id": self.backend_record.id, "odoo_id": record.id}
+        ) | self._create_bindings(["Y"])
+        calls = []
+
+        @contextmanager
+        def lock_timeout(cr, timeout, name=None):
+            calls.append(name)
+            if len(calls) == 1:
+                # the transaction is aborted, as on a lock timeout
+                try:
+                    cr.execute("SELECT 1 / 0", log_exceptions=False)
+                except psycopg2.DataError:
+                    raise psycopg2.OperationalError("timeout")
+            yield
+
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            adapter_class = type(exporter.backend_adapter)
+            with mock.patch(
+                "odoo.addons.connector.components.synchronizer.pg_lock_timeout",
+                side_effect=lock_timeout,
+            ), mock.patch.object(adapter_class, "create_many", return_value=[1]):
+                errors = exporter.run_batch(bindings)
+        self.assertEqual(list(errors), [bindings[0].id])
+        self.assertIsInstance(errors[bindings[0].id], RetryableJobError)
+        self.assertEqual(bindings.mapped("external_id"), [0, 1])
+
+    def test_run_batch_aborted_transaction(self):
+        """An error which aborted the transaction fails the chunk"""
+        bindings = self._create_bindings(["A", "B"])
+
+        def export_dependencies():
+            try:
+                self.env.cr.execute("SELECT 1 / 0", log_exceptions=False)
+            except psycopg2.DataError:
+                raise ValueError("aborted")
+
+        with self.backend_record.work_on("connector.test.binding") as work:
+            exporter = work.component(usage="record.exporter")
+            with mock.patch.object(
+                type(exporter), "_export_dependencies", side_effect=export_dependencies
+            ):
+                with self.assertRaises(ValueError):
+                    exporter.run_batch(bindings)
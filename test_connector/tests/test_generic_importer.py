@@ -0,0 +1,107 @@
+# Copyright 2021 Camptocamp SA
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html)
+
+import mock
+import psycopg2
+
+from odoo.exceptions import ValidationError
+from odoo.tools import mute_logger
+
+from odoo.addons.component.tests.common import TransactionComponentCase
+from odoo.addons.connector.exception import InvalidDataError
+
+
+class TestGenericImporter(TransactionComponentCase):
+    """Test the import of records by pages"""
+
+    def setUp(self):
+        super(TestGenericImporter, self).setUp()
+        self.backend_record = self.env["test.backend"].create({})
+
+    def test_import_pages(self):
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            record = self.env["connector.test.record"].create({"name": "old"})
+            binding = self.env["connector.test.binding"].create(
+                {"backend_id": self.backend_record.id, "odoo_id": record.id}
+            )
+            binder.bind(2, binding)
+
+            importer = work.component(usage="importer")
+            importer._page_size = 2
+            pages = [
+                [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}],
+                [{"id": 3, "name": "bad"}],
+            ]
+            importer.backend_adapter.search_read = mock.Mock(side_effect=pages)
+
+            def validate(data):
+                if data["name"] == "bad":
+                    raise InvalidDataError("bad")
+
+            with mock.patch.object(
+                type(importer), "_validate_data", side_effect=validate
+            ):
+                errors = importer.run()
+
+            self.assertEqual([3], list(errors))
+            self.assertIsInstance(errors[3], InvalidDataError)
+            self.assertEqual(2, importer.backend_adapter.search_read.call_count)
+            self.assertEqual(binding, binder.to_internal(2))
+            self.assertEqual("B", binding.name)
+            self.assertEqual("A", binder.to_internal(1).name)
+            self.assertEqual(self.backend_record, binder.to_internal(1).backend_id)
+            self.assertFalse(binder.to_internal(3))
+
+    def test_import_page_failed_record(self):
+        """A record failing in a batch does not prevent the others"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            importer = work.component(usage="importer")
+            page = [
+                {"id": 1, "name": "A"},
+                {"id": 2, "name": "invalid"},
+                {"id": 3, "name": "C"},
+            ]
+            importer.backend_adapter.search_read = mock.Mock(side_effect=[page, []])
+            errors = importer.run()
+
+            self.assertEqual([2], list(errors))
+            self.assertIsInstance(errors[2], ValidationError)
+            self.assertEqual("A", binder.to_internal(1).name)
+            self.assertFalse(binder.to_internal(2))
+            self.assertEqual("C", binder.to_internal(3).name)
+
+    def test_import_page_constraint_error(self):
+        """A record violating a SQL constraint does not prevent the others"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            binder = work.component(usage="binder")
+            importer = work.component(usage="importer")
+            page = [
+                {"id": 1, "name": "A"},
+                {"id": 2, "name": "sql invalid"},
+                {"id": 3, "name": "C"},
+            ]
+            importer.backend_adapter.search_read = mock.Mock(side_effect=[page, []])
+            with mute_logger("odoo.sql_db"):
+                errors = importer.run()
+
+            self.assertEqual([2], list(errors))
+            self.assertIsInstance(errors[2], psycopg2.IntegrityError)
+            self.assertEqual("A", binder.to_internal(1).name)
+            self.assertFalse(binder.to_internal(2))
+            self.assertEqual("C", binder.to_internal(3).name)
+
+    def test_import_page_database_error(self):
+        """A database error is not kept as the error of a record"""
+        with self.backend_record.work_on("connector.test.binding") as work:
+            importer = work.component(usage="importer")
+            page = [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]
+            importer.backend_adapter.search_read = mock.Mock(side_effect=[page, []])
+            with mock.patch.object(
+                type(self.env["connector.test.binding"]),
+                "create",
+                side_effect=psycopg2.OperationalError("deadlock detected"),
+            ):
+                with self.assertRaises(psycopg2.OperationalError):
+                    importer.run()